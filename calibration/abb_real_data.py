@@ -31,13 +31,28 @@ from time import sleep
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from threading import Thread
+from threading import Thread, Event
 from pathlib import Path
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import yaml
 import json
 import pickle
-import copy
+import struct
+import zlib
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 from pyabb import ABBRobot, Logger, Affine
 from pyati.ati_sensor import ATISensor
@@ -54,16 +69,361 @@ logger = Logger(log_level='DEBUG', name="ABB_Real_Data", log_path=None)
 
 TIME_STAMP = str(datetime.now().strftime('%y_%m_%d__%H_%M_%S'))
 
+# pickle协议5（PEP 574）：ndarray通过PickleBuffer直接写出底层内存，省去中间bytes拷贝
+PICKLE_PROTOCOL = 5
 
-def _load_available_objects(traj_path: Path) -> List[str]:
+# 追加日志：每条记录由若干帧组成，帧格式为 [u8 类型][u32 小端长度][payload]
+# 先是一帧结构描述（JSON，无法JSON化时退化为pickle），其中的ndarray替换为占位符，
+# 随后每个ndarray各占一帧（zlib压缩的原始字节）；日志超过 JOURNAL_COMPACT_BYTES 时合并回pkl
+JOURNAL_FRAME = struct.Struct('<BI')
+FRAME_JSON = 1
+FRAME_PICKLE = 2
+FRAME_NDARRAY = 3
+JOURNAL_ZLIB_LEVEL = 1
+JOURNAL_COMPACT_BYTES = 64 * 1024 * 1024
+
+# SoA快照中marker位移的量化步长（像素），int16可表示 ±327 px
+MARKER_QUANT_SCALE = 0.01
+
+
+def parse_traj_config(traj_path: Optional[Path] = None) -> Tuple[List[str], Dict[str, Dict[str, np.ndarray]]]:
+    """
+    读取并规范化轨迹配置，一次解析同时得到可用物体列表和轨迹数组
+
+    Returns:
+        (objects, config)：objects 为含有效轨迹的物体名列表，
+        config 为 {物体: {轨迹名: (N, 3) 的 (dx, dy, dz) 数组}}
+    """
+    traj_path = Path(traj_path) if traj_path else PROJ_DIR / "calibration" / "obj" / "traj.json"
     if not traj_path.exists():
-        return []
+        logger.warning(f"未找到轨迹配置文件: {traj_path}")
+        return [], {}
+
     try:
-        with open(traj_path, 'r', encoding='utf-8') as fp:
-            cfg = json.load(fp)
-        return list(cfg.keys()) if isinstance(cfg, dict) else []
-    except Exception:
-        return []
+        cached = _load_traj_config_cached(str(traj_path), traj_path.stat().st_mtime)
+    except Exception as exc:
+        logger.error(f"轨迹配置解析失败: {exc}")
+        return [], {}
+
+    if not cached:
+        logger.warning("轨迹配置中没有可用的轨迹")
+
+    # 外层字典浅拷贝，缓存中的只读数组直接共享
+    config = {obj_name: dict(obj_trajs) for obj_name, obj_trajs in cached.items()}
+    return list(config.keys()), config
+
+
+def _trajectory_steps_array(steps_payload) -> np.ndarray:
+    """
+    将单条轨迹的步进配置规范化为 (N, 3) float64 数组，每行为 (dx, dy, dz) mm
+
+    支持三种写法：[{"x":..,"y":..,"z":..}, ...]、[[dx, dy, dz], ...]、{"x": [...], "y": [...], "z": [...]}
+    """
+    if isinstance(steps_payload, list):
+        rows = []
+        for entry in steps_payload:
+            if isinstance(entry, dict):
+                rows.append((entry.get("x", 0.0), entry.get("y", 0.0), entry.get("z", 0.0)))
+            elif isinstance(entry, (list, tuple)) and len(entry) == 3:
+                rows.append(entry)
+        return np.array(rows, dtype=np.float64).reshape(-1, 3)
+
+    if isinstance(steps_payload, dict) and {"x", "y", "z"} <= steps_payload.keys():
+        x_seq, y_seq, z_seq = steps_payload["x"], steps_payload["y"], steps_payload["z"]
+        n = min(len(x_seq), len(y_seq), len(z_seq))
+        return np.array([x_seq[:n], y_seq[:n], z_seq[:n]], dtype=np.float64).T.copy()
+
+    return np.empty((0, 3), dtype=np.float64)
+
+
+@lru_cache(maxsize=4)
+def _load_traj_config_cached(path_str: str, mtime: float) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    解析并规范化轨迹配置，按 (路径, 修改时间) 缓存，文件被修改后自动失效
+
+    返回的 (N, 3) 数组设为只读，以免调用方改动缓存内容。
+    """
+    with open(path_str, 'rb') as fp:
+        raw_config = _json_loads(fp.read())
+
+    normalized: Dict[str, Dict[str, np.ndarray]] = {}
+
+    for obj_name, traj_dict in raw_config.items():
+        if not isinstance(traj_dict, dict):
+            continue
+
+        obj_trajs: Dict[str, np.ndarray] = {}
+
+        for traj_name, steps_payload in traj_dict.items():
+            try:
+                steps_xyz = _trajectory_steps_array(steps_payload)
+            except (TypeError, ValueError) as exc:
+                logger.warning(f"轨迹 {obj_name}/{traj_name} 格式无效，跳过: {exc}")
+                continue
+
+            if len(steps_xyz) > 0:
+                steps_xyz.setflags(write=False)
+                obj_trajs[traj_name] = steps_xyz
+
+        if obj_trajs:
+            normalized[obj_name] = obj_trajs
+
+    return normalized
+
+
+def _split_arrays(obj, arrays: List[np.ndarray]):
+    """将嵌套结构中的ndarray取出放入arrays，原位置替换为带dtype/shape的占位符"""
+    if isinstance(obj, np.ndarray):
+        arrays.append(obj)
+        return {'__ndarray__': len(arrays) - 1, 'dtype': obj.dtype.str, 'shape': list(obj.shape)}
+    if isinstance(obj, dict):
+        return {key: _split_arrays(value, arrays) for key, value in obj.items()}
+    if isinstance(obj, tuple):
+        return {'__tuple__': [_split_arrays(value, arrays) for value in obj]}
+    if isinstance(obj, list):
+        return [_split_arrays(value, arrays) for value in obj]
+    return obj
+
+
+def _join_arrays(obj, arrays: List[np.ndarray]):
+    """_split_arrays 的逆过程"""
+    if isinstance(obj, dict):
+        if '__ndarray__' in obj:
+            return arrays[obj['__ndarray__']]
+        if '__tuple__' in obj:
+            return tuple(_join_arrays(value, arrays) for value in obj['__tuple__'])
+        return {key: _join_arrays(value, arrays) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_join_arrays(value, arrays) for value in obj]
+    return obj
+
+
+def _check_json_keys(obj):
+    """JSON会把非字符串键静默转成字符串，遇到这类键时抛出TypeError，让记录改走pickle帧"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if not isinstance(key, str):
+                raise TypeError(f"非字符串键: {key!r}")
+            _check_json_keys(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            _check_json_keys(value)
+
+
+def _encode_journal_record(record: tuple) -> bytes:
+    """
+    按类型编码一条记录：结构描述走JSON，ndarray单独按原始字节zlib压缩
+
+    JSON无法无损表示的结构（NaN/inf、非字符串键、非基础类型）整体改用pickle帧。
+    """
+    arrays: List[np.ndarray] = []
+    skeleton = [_split_arrays(record, arrays)]
+    try:
+        _check_json_keys(skeleton)
+        tag, head = FRAME_JSON, json.dumps(skeleton, ensure_ascii=False, allow_nan=False).encode('utf-8')
+    except (TypeError, ValueError):
+        tag, head = FRAME_PICKLE, pickle.dumps(skeleton, protocol=PICKLE_PROTOCOL)
+
+    frames = [JOURNAL_FRAME.pack(tag, len(head)), head]
+    for arr in arrays:
+        payload = zlib.compress(np.ascontiguousarray(arr).tobytes(), JOURNAL_ZLIB_LEVEL)
+        frames.append(JOURNAL_FRAME.pack(FRAME_NDARRAY, len(payload)))
+        frames.append(payload)
+    return b''.join(frames)
+
+
+def _read_journal_frame(fp):
+    """读取一帧，返回 (类型, payload)；文件结束或帧不完整时返回 None"""
+    header = fp.read(JOURNAL_FRAME.size)
+    if len(header) < JOURNAL_FRAME.size:
+        return None
+    tag, length = JOURNAL_FRAME.unpack(header)
+    payload = fp.read(length)
+    if len(payload) < length:
+        return None
+    return tag, payload
+
+
+def _decode_journal_record(fp):
+    """从当前位置读取一条完整记录，记录不完整时返回 None"""
+    frame = _read_journal_frame(fp)
+    if frame is None:
+        return None
+    tag, head = frame
+    if tag == FRAME_JSON:
+        try:
+            skeleton = _json_loads(head)[0]
+        except ValueError:
+            # 旧版日志的JSON帧可能含NaN（orjson不接受），用标准库解析
+            skeleton = json.loads(head)[0]
+    else:
+        skeleton = pickle.loads(head)[0]
+
+    # 先按占位符收集数组描述，再依次读取对应的数组帧
+    specs: List[Dict] = []
+
+    def collect(obj):
+        if isinstance(obj, dict):
+            if '__ndarray__' in obj:
+                specs.append(obj)
+                return
+            for value in obj.values():
+                collect(value)
+        elif isinstance(obj, list):
+            for value in obj:
+                collect(value)
+
+    collect(skeleton)
+    specs.sort(key=lambda spec: spec['__ndarray__'])
+
+    arrays: List[np.ndarray] = []
+    for spec in specs:
+        frame = _read_journal_frame(fp)
+        if frame is None or frame[0] != FRAME_NDARRAY:
+            return None
+        # bytearray 缓冲区使还原的数组可写，与直接pickle保存的数组一致
+        arrays.append(np.frombuffer(bytearray(zlib.decompress(frame[1])), dtype=np.dtype(spec['dtype'])).reshape(spec['shape']))
+    return _join_arrays(skeleton, arrays)
+
+
+def _append_journal_record(journal_path: Path, record: tuple) -> int:
+    """将一条记录追加到日志文件末尾，返回写入后的日志大小"""
+    payload = _encode_journal_record(record)
+    with open(journal_path, 'ab') as fp:
+        fp.write(payload)
+        fp.flush()
+        os.fsync(fp.fileno())
+        return fp.tell()
+
+
+def _replay_journal(journal_path: Path, storage: Dict) -> int:
+    """
+    按顺序把日志记录重放到汇总字典上，返回成功重放的记录数
+
+    记录类型：
+        ('put', 物体, 轨迹键, 轨迹数据)  写入/覆盖一条轨迹
+        ('clear', 物体, None, None)     清空该物体的全部轨迹（覆盖模式）
+    末尾被截断的记录（采集中断时的半条写入）会从文件中截掉，保证之后的追加仍可读。
+    """
+    if not journal_path.exists():
+        return 0
+
+    replayed = 0
+    end = journal_path.stat().st_size
+    with open(journal_path, 'r+b') as fp:
+        while fp.tell() < end:
+            record_start = fp.tell()
+            record = _decode_journal_record(fp)
+            if record is None:
+                logger.warning(f"日志末尾记录不完整，已丢弃: {journal_path}")
+                fp.truncate(record_start)
+                break
+
+            op, obj_name, traj_key, traj_data = record
+            if op == 'put':
+                storage.setdefault(obj_name, {})[traj_key] = traj_data
+            elif op == 'clear':
+                storage[obj_name] = {}
+            replayed += 1
+    return replayed
+
+
+def _encode_marker(marker: np.ndarray, scale: float = MARKER_QUANT_SCALE) -> np.ndarray:
+    """将marker位移按固定步长量化为int16（超出范围的值截断到int16边界）"""
+    info = np.iinfo(np.int16)
+    return np.clip(np.round(np.asarray(marker) / scale), info.min, info.max).astype(np.int16)
+
+
+def _decode_marker(q: np.ndarray, scale: float = MARKER_QUANT_SCALE) -> np.ndarray:
+    """将int16量化的marker位移还原为float32"""
+    return q.astype(np.float32) * np.float32(scale)
+
+
+def load_soa_snapshot(snapshot_path: Path) -> Dict:
+    """
+    读取SoA快照并还原为与汇总pkl相同的嵌套字典结构
+
+    快照内容：
+        marker_q:     (M, 20, 11, 2) int16，所有步的marker位移按行拼接，乘以 marker_scale 还原为像素
+        marker_scale: 量化步长（像素）
+        force_all:  (M, 3) float32，所有步的三维力按行拼接
+        index_json: 第i行对应的 [物体, 轨迹, 步, metadata]
+    """
+    with np.load(snapshot_path, allow_pickle=False) as data:
+        if 'marker_q' in data:
+            marker_all = _decode_marker(data['marker_q'], float(data['marker_scale']))
+        else:
+            marker_all = data['marker_all']  # 旧版未量化快照
+        force_all = data['force_all']
+        index = json.loads(str(data['index_json']))
+
+    storage: Dict = {}
+    for row, (obj_name, traj_key, step_key, metadata) in enumerate(index):
+        storage.setdefault(obj_name, {}).setdefault(traj_key, {})[step_key] = {
+            'marker_displacement': marker_all[row],
+            'force_xyz': force_all[row],
+            'metadata': metadata,
+            'depth_field': None
+        }
+    return storage
+
+
+def _flatten_storage(storage: Dict):
+    """
+    将嵌套的汇总字典按步展开为列式数组
+
+    Returns:
+        (index, marker_q, force_all)：index 为每行的 [物体, 轨迹, 步, metadata]，
+        marker_q 为 int16 量化的 (M, 20, 11, 2) marker位移，force_all 为 (M, 3) float32；无数据时返回 None
+    """
+    index = []
+    markers = []
+    forces = []
+    for obj_name, obj_data in storage.items():
+        for traj_key, traj_steps in obj_data.items():
+            for step_key, step_data in traj_steps.items():
+                if not isinstance(step_data, dict) or 'force_xyz' not in step_data:
+                    continue
+                index.append([obj_name, traj_key, step_key, step_data.get('metadata', {})])
+                markers.append(step_data['marker_displacement'])
+                forces.append(step_data['force_xyz'])
+
+    if not index:
+        return None
+    return index, _encode_marker(np.stack(markers)), np.stack(forces).astype(np.float32, copy=False)
+
+
+def load_parquet_table(table_path: Path) -> Dict:
+    """
+    读取Parquet列式表并还原为与汇总pkl相同的嵌套字典结构
+
+    列：object, trajectory（字典编码）, step, fx, fy, fz, marker（int16原始字节）, metadata（JSON）
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("读取 .parquet 快照需要安装 pyarrow")
+
+    table = pq.read_table(table_path)
+    schema_meta = table.schema.metadata or {}
+    marker_shape = tuple(json.loads(schema_meta[b'marker_shape']))
+    scale = float(schema_meta[b'marker_scale'])
+    df = table.to_pandas()
+
+    # 与pkl中的数组一致保持可写：to_numpy 可能返回只读视图，显式复制
+    force_all = df[['fx', 'fy', 'fz']].to_numpy(dtype=np.float32, copy=True)
+    marker_q = np.frombuffer(bytearray(b''.join(df['marker'])), dtype=np.int16).reshape((-1,) + marker_shape)
+    marker_all = _decode_marker(marker_q, scale)
+
+    storage: Dict = {}
+    for (obj_name, traj_key), rows in df.groupby(['object', 'trajectory'], sort=False, observed=True).indices.items():
+        traj_steps = storage.setdefault(obj_name, {}).setdefault(traj_key, {})
+        for row in rows:
+            traj_steps[df['step'].iat[row]] = {
+                'marker_displacement': marker_all[row],
+                'force_xyz': force_all[row],
+                'metadata': json.loads(df['metadata'].iat[row]),
+                'depth_field': None
+            }
+    return storage
 
 
 class TactileSensor():
@@ -120,7 +480,8 @@ class ABBDataCollector():
                 else:
                     raise
 
-    def __init__(self, pose0, object_name="cube", config_file=None, storage_file=None, repeat_count=1, overwrite=False):
+    def __init__(self, pose0, object_name="cube", config_file=None, storage_file=None, repeat_count=1, overwrite=False,
+                 pre_parsed_config: Optional[Dict[str, Dict[str, np.ndarray]]] = None):
         """
         初始化数据采集器
 
@@ -131,6 +492,7 @@ class ABBDataCollector():
             storage_file: 数据存储文件路径
             repeat_count: 每条轨迹重复采集次数
             overwrite: 是否覆盖之前的所有运行记录
+            pre_parsed_config: parse_traj_config 已解析的轨迹配置，提供时不再重复读取traj.json
         """
         self.object_name = object_name
         self.repeat_count = max(1, repeat_count)  # 至少执行1次
@@ -148,12 +510,18 @@ class ABBDataCollector():
         self.safe_offset_mm = float(self.config.get('safe_offset_mm', 1.0))
         self.frame_interval = float(self.config.get('frame_interval', 0.1))
         self.data_frames = int(self.config.get('data_frames', 30))
-        self.trajectory_config = self._load_trajectory_config()
+        self.sample_interval = float(self.config.get('sample_interval', 0.002))
+        self.motion_poll_interval = float(self.config.get('motion_poll_interval', 0.005))
+        self.pose_resync_steps = int(self.config.get('pose_resync_steps', 20))
+        self.trajectory_config = pre_parsed_config if pre_parsed_config is not None else self._load_trajectory_config()
 
         # 数据汇总文件
         default_storage = PROJ_DIR / "calibration" / "data" / "real_calibration_data.pkl"
         self.storage_file = Path(storage_file) if storage_file else default_storage
         self.storage_file.parent.mkdir(exist_ok=True, parents=True)
+        self.journal_file = self.storage_file.with_suffix('.journal')
+        # 最近一次 _load_storage 重放日志是否失败；失败时 _save_storage 不删除日志
+        self._journal_replay_failed = False
 
         # 初始化机器人
         self.robot = ABBRobot(
@@ -165,6 +533,10 @@ class ABBDataCollector():
         logger.warning("Connect to Server")
         self.robot.initialize()
 
+        # 最近一次下发的目标位姿，连续相对运动时替代 get_cartesian 查询；为None时需重新读取
+        self._last_pose = None
+        self._moves_since_sync = 0
+
         # 设置运动参数
         self.robot.set_acceleration(0.5, 0.5)
         self._safe_set_velocity(20, 20)
@@ -191,6 +563,19 @@ class ABBDataCollector():
         # 初始化触觉传感器
         self.sensor = TactileSensor()
         self.rot_sensor = (Affine(a=180)*Affine(a=-90,c=180).inverse()*Affine(a=-45)).rotation()
+        self._rot_sensor_arr = np.ascontiguousarray(self.rot_sensor, dtype=np.float32)
+        # 展平为9个Python浮点数，单次读数时用标量乘加代替NumPy矩阵乘的调度开销
+        self._rs = tuple(float(x) for x in np.asarray(self.rot_sensor).ravel())
+
+        # ATI采样线程（单生产者）+ 预分配环形缓冲（单消费者: _collect_current_step_data）
+        # 生产者先写槽位再递增 _ring_head，整数赋值在CPython中是原子的，无需额外加锁
+        window_samples = int(np.ceil(self.data_frames * self.frame_interval / self.sample_interval))
+        self._ring_capacity = max(self.data_frames, 2 * window_samples)
+        self._force_buf = np.empty((self._ring_capacity, 3), np.float32)
+        self._ring_head = 0
+        self._sampler_stop = Event()
+        self._sampler = Thread(target=self._sample_ati_loop, name="ati_sampler", daemon=True)
+        self._sampler.start()
         # self.View = ExampleView(self.sensor.sensor)
         # self.View2d = self.View.create2d(Sensor.OutputType.Difference, Sensor.OutputType.Depth)
         # def callback():
@@ -221,63 +606,17 @@ class ABBDataCollector():
             'max_force': -1,      # N
             'data_frames': 40,     # 每步采集数据帧数
             'frame_interval': 0.1,  # 帧间隔时间 s
+            'sample_interval': 0.002,  # ATI采样线程间隔 s
             'step_settle_time': 0.3,  # 每步运动后的等待时间 s
+            'motion_poll_interval': 0.005,  # 轮询机器人运动完成的间隔 s
+            'pose_resync_steps': 20,  # 连续相对运动多少步后重新读取实际位姿
             'safe_offset_mm': 8.0,    # 安全抬起高度 mm
             'zero_contact_tolerance': 0.25  # 零接触验证容差（25%）
         }
 
-    def _load_trajectory_config(self) -> Dict[str, Dict[str, List[Dict[str, float]]]]:
-        """读取轨迹配置"""
-        traj_path = PROJ_DIR / "calibration" / "obj" / "traj.json"
-        if not traj_path.exists():
-            logger.warning(f"未找到轨迹配置文件: {traj_path}")
-            return {}
-
-        try:
-            with open(traj_path, 'r', encoding='utf-8') as fp:
-                raw_config = json.load(fp)
-        except Exception as exc:
-            logger.error(f"轨迹配置解析失败: {exc}")
-            return {}
-
-        normalized: Dict[str, Dict[str, List[Dict[str, float]]]] = {}
-
-        for obj_name, traj_dict in raw_config.items():
-            if not isinstance(traj_dict, dict):
-                continue
-
-            obj_trajs: Dict[str, List[Dict[str, float]]] = {}
-
-            for traj_name, steps_payload in traj_dict.items():
-                steps: List[Dict[str, float]] = []
-
-                if isinstance(steps_payload, list):
-                    for entry in steps_payload:
-                        if isinstance(entry, dict):
-                            dx = float(entry.get("x", 0.0))
-                            dy = float(entry.get("y", 0.0))
-                            dz = float(entry.get("z", 0.0))
-                            steps.append({"x": dx, "y": dy, "z": dz})
-                        elif isinstance(entry, (list, tuple)) and len(entry) == 3:
-                            dx, dy, dz = map(float, entry)
-                            steps.append({"x": dx, "y": dy, "z": dz})
-                elif isinstance(steps_payload, dict) and {"x", "y", "z"} <= steps_payload.keys():
-                    x_seq = steps_payload.get("x", [])
-                    y_seq = steps_payload.get("y", [])
-                    z_seq = steps_payload.get("z", [])
-                    for dx, dy, dz in zip(x_seq, y_seq, z_seq):
-                        steps.append({"x": float(dx), "y": float(dy), "z": float(dz)})
-
-                if steps:
-                    obj_trajs[traj_name] = steps
-
-            if obj_trajs:
-                normalized[obj_name] = obj_trajs
-
-        if not normalized:
-            logger.warning("轨迹配置中没有可用的轨迹")
-
-        return normalized
+    def _load_trajectory_config(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """读取轨迹配置，每条轨迹规范化为 (N, 3) 的 (dx, dy, dz) 数组"""
+        return parse_traj_config()[1]
 
     def _check_joint_limit(self):
         """检查关节限位"""
@@ -298,29 +637,68 @@ class ABBDataCollector():
         pose = self._safe_get_cartesian()
         return pose.x, pose.y, pose.z
 
-    def get_ati_data(self):
-        """获取ATI传感器数据"""
-        return self.ati.data.copy()
-
     def get_sensor_force_xyz(self):
-        force_xyz = self.get_ati_data()[0:3]
-        return self.rot_sensor @ force_xyz
+        """获取传感器坐标系下的三维力 (fx, fy, fz)，逐元素读取ATI数据并做标量旋转"""
+        data = self.ati.data
+        fx, fy, fz = float(data[0]), float(data[1]), float(data[2])
+        r = self._rs
+        return (r[0] * fx + r[1] * fy + r[2] * fz,
+                r[3] * fx + r[4] * fy + r[5] * fz,
+                r[6] * fx + r[7] * fy + r[8] * fz)
+
+    @staticmethod
+    def _precise_sleep(deadline_ns: int, spin_ns: int = 2_000_000):
+        """
+        睡眠至 time.monotonic_ns() 时基下的 deadline_ns
+
+        距离目标超过 spin_ns 时用 time.sleep 粗睡，最后一段忙等，
+        避免 time.sleep 的调度抖动与过睡（Windows下可达5-15ms）。spin_ns=0 时不忙等。
+        """
+        while True:
+            remaining = deadline_ns - time.monotonic_ns()
+            if remaining <= 0:
+                return
+            if remaining > spin_ns:
+                time.sleep((remaining - spin_ns) / 1e9)
+
+    def _sample_ati_loop(self):
+        """ATI采样线程：按固定节拍将原始fxyz写入环形缓冲，旋转在取数时统一完成"""
+        interval_ns = int(self.sample_interval * 1e9)
+        deadline = time.monotonic_ns()
+        while not self._sampler_stop.is_set():
+            self._force_buf[self._ring_head % self._ring_capacity] = self.ati.data[0:3]
+            self._ring_head += 1
+            # 按截止时间推进节拍，避免累计漂移；落后时直接对齐当前时间，不补采
+            # 采样线程不忙等，以免与主线程争抢GIL
+            deadline = max(deadline + interval_ns, time.monotonic_ns())
+            self._precise_sleep(deadline, spin_ns=0)
+
+    def _wait_motion_done(self):
+        """以短间隔轮询等待机器人运动结束"""
+        while self.robot.moving:
+            time.sleep(self.motion_poll_interval)
 
     def move_to_xyz(self, x, y, z):
         """移动到指定位置"""
         cp = self._safe_get_cartesian()
         target_pose = Affine(x=x, y=y, z=z, a=cp.a, b=cp.b, c=cp.c)
         self.robot.moveCart(target_pose)
-        while self.robot.moving:
-            time.sleep(self.step_settle_time)
+        self._last_pose = target_pose
+        self._moves_since_sync = 0
+        self._wait_motion_done()
 
     def move_delta_xyz(self, dx=0, dy=0, dz=0):
-        """移动到指定位置"""
-        cp = self._safe_get_cartesian()
+        """相对当前位置平移，基于上一次下发的目标位姿计算，每 pose_resync_steps 步重新读取实际位姿"""
+        if self._last_pose is None or self._moves_since_sync >= self.pose_resync_steps:
+            cp = self._safe_get_cartesian()
+            self._moves_since_sync = 0
+        else:
+            cp = self._last_pose
         target_pose = Affine(x=cp.x + dx, y=cp.y + dy, z=cp.z + dz, a=cp.a, b=cp.b, c=cp.c)
         self.robot.moveCart(target_pose)
-        while self.robot.moving:
-            time.sleep(self.step_settle_time)
+        self._last_pose = target_pose
+        self._moves_since_sync += 1
+        self._wait_motion_done()
 
 
     def relative_move(self, x=0, y=0, z=0, Rz=0, Ry=0, Rx=0):
@@ -329,8 +707,8 @@ class ABBDataCollector():
         target_pose = (Affine(x=cp.x, y=cp.y, z=cp.z, a=cp.a, b=cp.b, c=cp.c) *
                       Affine(x=x, y=y, z=z, a=Rz, b=Ry, c=Rx))
         self.robot.moveCart(target_pose)
-        while self.robot.moving:
-            time.sleep(0.01)
+        self._last_pose = None
+        self._wait_motion_done()
 
 
     def move_to_contact(self):
@@ -350,15 +728,16 @@ class ABBDataCollector():
         self._safe_set_velocity(self.config['approach_speed'], self.config['approach_speed'])
 
         is_contact = False
+        poll_interval_ns = 200_000_000  # 每次下移后的稳定等待 0.2s
 
         while not is_contact:
             # 安全检测
-            fz = self.get_ati_data()[2]
+            fz = self.ati.data[2]
             if fz <= self.config['max_force']:
                 logger.error(f'力过大，退出: {fz}N')
                 raise RuntimeError(f'Force too large: {fz}N')
 
-            fz_current = self.get_ati_data()[2]
+            fz_current = self.ati.data[2]
             # logger.debug(f'ATI Z方向力: {fz_current}N')
 
             # 检测接触
@@ -371,7 +750,8 @@ class ABBDataCollector():
             # 向下移动
             # self.move_delta_xyz(dz=-0.01)
             self.relative_move(z=0.02)
-            time.sleep(0.2)
+            # 从运动结束时刻起等待一个完整周期，再读取力做安全/接触判断
+            self._precise_sleep(time.monotonic_ns() + poll_interval_ns)
 
         if not is_contact:
             raise RuntimeError("未检测到接触")
@@ -382,6 +762,7 @@ class ABBDataCollector():
             logger.info(f"修正接触位置: {self.z_cont} -> 113.54 mm")
             self.z_cont = 113.54
         self.robot.moveCart([556.58, -199.08, self.z_cont+0.15, 0, 1, 0, 0])
+        self._last_pose = None
         time.sleep(0.5)
 
         # 恢复正常速度
@@ -403,8 +784,7 @@ class ABBDataCollector():
             if self.object_name in storage:
                 old_count = len(storage[self.object_name])
                 logger.warning(f"🗑️  覆盖模式：清空 {self.object_name} 的 {old_count} 条旧记录")
-                storage[self.object_name] = {}
-                self._save_storage(storage)
+                self._append_record('clear', self.object_name)
             else:
                 logger.info(f"覆盖模式：{self.object_name} 无旧数据")
 
@@ -578,20 +958,20 @@ class ABBDataCollector():
             logger.error(f"{traj_name}: 零接触验证数据提取失败: {e}")
             return False
 
-    def _execute_trajectory(self, trajectory_name: str, steps: List[Dict[str, float]], run_id: int = 0, is_last_attempt: bool = False) -> Optional[Dict[str, Dict]]:
+    def _execute_trajectory(self, trajectory_name: str, steps: np.ndarray, run_id: int = 0, is_last_attempt: bool = False) -> Optional[Dict[str, Dict]]:
         """
         执行单条轨迹并采集每一步的数据（采集前3步后立即验证零接触）
 
         Args:
             trajectory_name: 轨迹名称
-            steps: 轨迹步骤列表
+            steps: 轨迹步骤数组 (N, 3)，每行为 (dx, dy, dz) mm
             run_id: 运行编号
             is_last_attempt: 是否为最后一次尝试（最后一次时即使验证失败也继续采集完整轨迹）
 
         Returns:
             成功时返回轨迹数据字典，失败时返回带 '_validation_failed' 标记的字典或 None
         """
-        if not steps:
+        if len(steps) == 0:
             return None
 
         logger.info(f"执行轨迹 {trajectory_name} (run{run_id})，共 {len(steps)} 步")
@@ -604,16 +984,17 @@ class ABBDataCollector():
         trajectory_data: Dict[str, Dict] = {}
         traj_key_with_run = f"{trajectory_name}_run{run_id}"
 
-        for idx, step in enumerate(steps):
-            dx = float(step.get('x', 0.0))
-            dy = float(step.get('y', 0.0))
-            dz = float(step.get('z', 0.0))
+        # 步键名与不随步变化的metadata字段在循环外一次生成
+        step_keys = [f"step_{i:03d}" for i in range(len(steps))]
+        base_meta = {'trajectory': trajectory_name, 'run_id': run_id}
 
+        for idx, (dx, dy, dz) in enumerate(steps.tolist()):
             self.move_delta_xyz(dx=dx, dy=dy, dz=dz)
+            # 运动结束后等待力/marker稳定，再开始本步的平均窗口（采样缓冲区在采集时从此刻之后取数）
+            time.sleep(self.step_settle_time)
 
             metadata = {
-                'trajectory': trajectory_name,
-                'run_id': run_id,
+                **base_meta,
                 'step_index': idx,
                 'commanded_delta_mm': (dx, dy, dz),
                 'timestamp': datetime.now().isoformat()
@@ -621,8 +1002,7 @@ class ABBDataCollector():
 
             step_data = self._collect_current_step_data(metadata=metadata)
             if step_data:
-                step_key = f"step_{idx:03d}"
-                trajectory_data[step_key] = step_data
+                trajectory_data[step_keys[idx]] = step_data
 
             # 在采集完step2后立即进行零接触验证
             if idx == 2:  # step_002 刚采集完
@@ -643,15 +1023,25 @@ class ABBDataCollector():
         return trajectory_data
 
     def _collect_current_step_data(self, metadata: Optional[Dict] = None) -> Dict:
-        """采集当前姿态下的数据"""
+        """采集当前姿态下的数据（力取采样窗口内均值，marker在窗口中点采集以对齐时间）"""
         try:
-            force_data_list = []
+            window_ns = int(self.data_frames * self.frame_interval * 1e9)
+            t_start = time.monotonic_ns()
+            head_start = self._ring_head
+            self._precise_sleep(t_start + window_ns // 2)
             marker_disp = self.sensor.get_data()
-            for _ in range(self.data_frames):
-                force_xyz = self.get_sensor_force_xyz()
-                force_data_list.append(force_xyz)
-                time.sleep(self.frame_interval)
-            avg_force = np.mean(force_data_list, axis=0)
+            self._precise_sleep(t_start + window_ns)
+
+            head_end = self._ring_head
+            n_samples = min(head_end - head_start, self._ring_capacity)
+            if n_samples > 0:
+                slots = np.arange(head_end - n_samples, head_end) % self._ring_capacity
+                raw_mean = self._force_buf[slots].mean(axis=0, dtype=np.float64)
+                # 旋转是线性变换，与求均值可交换：先均值后旋转，只做一次矩阵乘
+                avg_force = self._rot_sensor_arr @ raw_mean
+            else:
+                logger.warning("采样窗口内无ATI数据，退化为单次读取")
+                avg_force = np.array(self.get_sensor_force_xyz())
 
             data = {
                 'marker_displacement': marker_disp.astype(np.float32),
@@ -660,7 +1050,8 @@ class ABBDataCollector():
                 'depth_field': None
             }
 
-            logger.debug(f"step {metadata['step_index'] if metadata else 'unknown'}: force={avg_force}")
+            logger.debug(f"step {metadata['step_index'] if metadata else 'unknown'}: "
+                         f"force={avg_force} ({n_samples} samples)")
             return data
 
         except Exception as e:
@@ -688,38 +1079,63 @@ class ABBDataCollector():
         time.sleep(0.5)
 
     def _load_storage(self) -> Dict:
-        if not self.storage_file.exists():
-            return {}
+        """读取汇总pkl并重放尚未合并的追加日志"""
+        data: Dict = {}
+        if self.storage_file.exists():
+            try:
+                with open(self.storage_file, 'rb') as fp:
+                    loaded = pickle.load(fp)
+                data = loaded if isinstance(loaded, dict) else {}
+            except Exception as exc:
+                logger.error(f"读取汇总文件失败: {exc}")
+                return {}
+
         try:
-            with open(self.storage_file, 'rb') as fp:
-                data = pickle.load(fp)
-            return data if isinstance(data, dict) else {}
+            _replay_journal(self.journal_file, data)
+            self._journal_replay_failed = False
         except Exception as exc:
-            logger.error(f"读取汇总文件失败: {exc}")
-            return {}
+            # 日志中仍有未能并入的记录，之后保存时必须保留日志文件
+            self._journal_replay_failed = True
+            logger.error(f"重放追加日志失败，日志文件将保留: {exc}")
+        return data
 
     def _save_storage(self, data: Dict):
-        with open(self.storage_file, 'wb') as fp:
-            pickle.dump(data, fp)
+        """
+        整体写出汇总pkl（先写临时文件再替换）
+
+        日志已完整重放并入时删除日志；重放失败时保留日志，避免其中的记录永久丢失。
+        """
+        tmp_file = self.storage_file.with_suffix('.pkl.tmp')
+        with open(tmp_file, 'wb') as fp:
+            pickle.dump(data, fp, protocol=PICKLE_PROTOCOL)
+        os.replace(tmp_file, self.storage_file)
+        if self._journal_replay_failed:
+            logger.warning(f"追加日志未能完整重放，保留: {self.journal_file}")
+        else:
+            self.journal_file.unlink(missing_ok=True)
         logger.info(f"汇总数据已写入: {self.storage_file}")
 
+    def _append_record(self, op: str, obj_name: str, traj_key: Optional[str] = None, traj_data: Optional[Dict] = None):
+        """
+        向追加日志写入一条记录，写入量只与本条轨迹有关
+
+        日志超过 JOURNAL_COMPACT_BYTES 时合并回汇总pkl。
+        """
+        journal_size = _append_journal_record(self.journal_file, (op, obj_name, traj_key, traj_data))
+        if journal_size > JOURNAL_COMPACT_BYTES:
+            logger.info(f"追加日志达到 {journal_size / 1e6:.1f} MB，合并到汇总文件")
+            self._save_storage(self._load_storage())
+
     def _save_single_trajectory(self, traj_key_with_run: str, traj_data: Dict):
         """
-        立即保存单条轨迹数据到存储文件
+        立即保存单条轨迹数据（追加到日志，不重写汇总文件）
 
         Args:
             traj_key_with_run: 轨迹键名（格式：traj_0_run0）
             traj_data: 轨迹数据字典
         """
         try:
-            storage = self._load_storage()
-            storage.setdefault(self.object_name, {})
-
-            # 保存单条轨迹
-            storage[self.object_name][traj_key_with_run] = copy.deepcopy(traj_data)
-
-            # 立即写入文件
-            self._save_storage(storage)
+            self._append_record('put', self.object_name, traj_key_with_run, traj_data)
             logger.info(f"💾 已立即保存: {self.object_name}/{traj_key_with_run} ({len(traj_data)} steps)")
 
         except Exception as e:
@@ -728,11 +1144,14 @@ class ABBDataCollector():
 
     def save_calibration_data(self):
         """
-        将采集结果写入统一汇总文件（作为最终确认，实际数据已在采集时实时保存）
-        此方法主要用于 cleanup 时的最终检查和补遗
+        将采集结果写入统一汇总文件（作为最终确认，实际数据已在采集时追加到日志）
+        此方法主要用于 cleanup 时的最终检查、补遗，以及把日志合并回汇总pkl
+
+        即使 calibration_data 为空（采集中途失败、仅写入了覆盖模式的清空记录）也会合并日志，
+        保证已实时保存的轨迹进入pkl，且旧日志不会在之后的重放中覆盖pkl上的修改。
         """
-        if not self.calibration_data:
-            logger.info("所有数据已在采集时实时保存")
+        if not self.calibration_data and not self.journal_file.exists():
+            logger.info("没有需要合并的数据")
             return self.storage_file
 
         storage = self._load_storage()
@@ -744,28 +1163,88 @@ class ABBDataCollector():
             for traj_key_with_run, traj_steps in obj_data.items():
                 # 检查是否已保存（实时保存时已写入）
                 if traj_key_with_run not in storage[obj_name]:
-                    storage[obj_name][traj_key_with_run] = copy.deepcopy(traj_steps)
+                    storage[obj_name][traj_key_with_run] = traj_steps
                     saved_count += 1
                     logger.debug(f"补遗保存: {obj_name}/{traj_key_with_run}")
 
+        # 无论是否有补遗，都把追加日志合并为单个pkl，供下游脚本直接读取
+        self._save_storage(storage)
         if saved_count > 0:
-            self._save_storage(storage)
             logger.info(f"✓ cleanup 补遗保存 {saved_count} 条轨迹记录")
         else:
             logger.info(f"✓ 所有 {len(self.calibration_data.get(self.object_name, {}))} 条轨迹已在采集时实时保存")
 
+        self._save_soa_snapshot(storage)
         return self.storage_file
 
+    def _save_soa_snapshot(self, storage: Dict):
+        """
+        将汇总数据另存为压缩的SoA快照（与pkl同名的.npz），安装了pyarrow时另存一份Parquet列式表
+
+        所有步的marker位移拼接为int16量化数组（步长 MARKER_QUANT_SCALE 像素），三维力拼接为float32数组，
+        行号与 (物体, 轨迹, 步) 的映射保存在JSON索引中，供批量读取/拟合使用。
+        pkl仍为主存储格式，下游脚本无需改动。
+        """
+        flat = _flatten_storage(storage)
+        if flat is None:
+            return
+        index, marker_q, force_all = flat
+
+        snapshot_path = self.storage_file.with_suffix('.npz')
+        try:
+            np.savez_compressed(
+                snapshot_path,
+                marker_q=marker_q,
+                marker_scale=np.float32(MARKER_QUANT_SCALE),
+                force_all=force_all,
+                index_json=np.array(json.dumps(index, ensure_ascii=False))
+            )
+            logger.info(f"SoA快照已写入: {snapshot_path} ({len(index)} steps)")
+        except Exception as exc:
+            logger.error(f"SoA快照写入失败: {exc}")
+
+        if PYARROW_AVAILABLE:
+            self._save_parquet_table(index, marker_q, force_all)
+
+    def _save_parquet_table(self, index: List, marker_q: np.ndarray, force_all: np.ndarray):
+        """将展开后的数据写为zstd压缩的Parquet表（与pkl同名的.parquet）"""
+        table_path = self.storage_file.with_suffix('.parquet')
+        try:
+            table = pa.table({
+                'object': pa.array([row[0] for row in index]).dictionary_encode(),
+                'trajectory': pa.array([row[1] for row in index]).dictionary_encode(),
+                'step': pa.array([row[2] for row in index]),
+                'fx': pa.array(force_all[:, 0]),
+                'fy': pa.array(force_all[:, 1]),
+                'fz': pa.array(force_all[:, 2]),
+                'marker': pa.array([m.tobytes() for m in marker_q], type=pa.large_binary()),
+                'metadata': pa.array([json.dumps(row[3], ensure_ascii=False) for row in index]),
+            })
+            table = table.replace_schema_metadata({
+                'marker_shape': json.dumps(list(marker_q.shape[1:])),
+                'marker_scale': str(MARKER_QUANT_SCALE),
+            })
+            pq.write_table(table, table_path, compression='zstd')
+            logger.info(f"Parquet表已写入: {table_path} ({table.num_rows} steps)")
+        except Exception as exc:
+            logger.error(f"Parquet表写入失败: {exc}")
+
     def cleanup(self):
         """清理资源"""
         logger.info("清理资源...")
 
+        # 停止ATI采样线程
+        self._sampler_stop.set()
+        self._sampler.join(timeout=1.0)
+
         # 移动到安全位置
         self.move_to_safe_position()
 
-        # 保存数据
-        if self.calibration_data:
+        # 保存数据：无论本次是否采集完成，都把追加日志合并进汇总pkl
+        try:
             self.save_calibration_data()
+        except Exception as exc:
+            logger.error(f"合并汇总数据失败，追加日志保留在 {self.journal_file}: {exc}")
 
         # 释放传感器
         try:
@@ -785,7 +1264,8 @@ class ABBDataCollector():
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="ABB真实触觉数据采集（支持多次重复采集）")
-    parser.add_argument("--object", required=True, default="circle_r3", help="需要采集的物体名称，与traj.json保持一致")
+    parser.add_argument("--object", required=True, nargs='+', default=["circle_r3"],
+                        help="需要采集的物体名称，与traj.json保持一致；可一次指定多个，共用同一套硬件连接依次采集（每换一个物体需操作员确认）")
     parser.add_argument("--pose", nargs=7, type=float, metavar=('x', 'y', 'z', 'qw', 'qx', 'qy', 'qz'),
                         help="机器人初始位姿，未提供时使用脚本内默认")
     parser.add_argument("--config", type=str, default=None, help="自定义采集配置文件路径")
@@ -800,11 +1280,11 @@ def main():
     """主函数"""
     args = parse_args()
 
-    traj_path = PROJ_DIR / "calibration" / "obj" / "traj.json"
-    available_objects = _load_available_objects(traj_path)
+    available_objects, traj_config = parse_traj_config()
 
-    if available_objects and args.object not in available_objects:
-        logger.error(f"物体 {args.object} 不在轨迹配置中。可用物体: {available_objects}")
+    missing = [obj for obj in args.object if obj not in available_objects]
+    if available_objects and missing:
+        logger.error(f"物体 {missing} 不在轨迹配置中。可用物体: {available_objects}")
         return
 
     pose0_default = [556.58, -199.08, 114.10 + 20, 0, 1, 0, 0]
@@ -813,29 +1293,44 @@ def main():
 
     collector = ABBDataCollector(
         pose0=pose0,
-        object_name=args.object,
+        object_name=args.object[0],
         config_file=args.config,
         storage_file=args.storage,
         repeat_count=args.repeat,
-        overwrite=args.overwrite
+        overwrite=args.overwrite,
+        pre_parsed_config=traj_config
     )
 
     if args.dry_run:
         logger.info("dry-run 模式：仅检查配置，不执行运动")
-        logger.info(f"可用轨迹: {list(collector.trajectory_config.get(args.object, {}).keys())}")
+        for obj_name in args.object:
+            logger.info(f"{obj_name} 可用轨迹: {list(collector.trajectory_config.get(obj_name, {}).keys())}")
         collector.cleanup()
         return
 
     try:
-        calibration_data = collector.collect_calibration_data()
-
-        logger.info("=" * 60)
-        logger.info("标定数据采集完成")
-        for obj_name, obj_data in calibration_data.items():
-            logger.info(f"物体: {obj_name}, 总记录数: {len(obj_data)}")
-            for traj_key, steps in obj_data.items():
-                logger.info(f"  {traj_key}: {len(steps)} steps")
-        logger.info("=" * 60)
+        for index, target_object in enumerate(args.object):
+            # 同一个采集器依次采集多个物体，机器人/ATI/传感器只初始化一次
+            if index > 0:
+                # 换物体前抬到安全高度，等待操作员更换并确认，避免在上一个物体上采集却记在新名字下
+                collector.move_to_safe_position()
+                try:
+                    answer = input(f"请将物体更换为 {target_object}，完成后按回车继续（输入 q 结束）: ")
+                except EOFError:
+                    answer = 'q'
+                if answer.strip().lower() == 'q':
+                    logger.warning(f"操作员未确认更换物体，停止采集，剩余物体: {args.object[index:]}")
+                    break
+            collector.object_name = target_object
+            calibration_data = collector.collect_calibration_data()
+
+            logger.info("=" * 60)
+            logger.info("标定数据采集完成")
+            for obj_name, obj_data in calibration_data.items():
+                logger.info(f"物体: {obj_name}, 总记录数: {len(obj_data)}")
+                for traj_key, steps in obj_data.items():
+                    logger.info(f"  {traj_key}: {len(steps)} steps")
+            logger.info("=" * 60)
 
     except Exception as e:
         logger.error(f"数据采集过程中发生错误: {e}")
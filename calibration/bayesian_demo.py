@@ -9,7 +9,7 @@ Function: Use Bayesian Optimization to efficiently find optimal quadratic functi
 """
 
 import numpy as np
-from typing import Tuple, List, Callable, Union
+from typing import Tuple, List, Callable, Union, Optional
 import time
 import matplotlib.pyplot as plt
 from scipy.stats import norm
@@ -302,31 +302,25 @@ class BayesianOptimizer:
         Returns:
             np.ndarray: Thompson采样值，形状为 (n_points,)
         """
-        # Sample multiple functions from GP posterior
-        n_points = X.shape[0]
-        samples = np.zeros(n_points)
-
-        for _ in range(self.n_samples):
-            # Sample from GP posterior
-            mean, var = self.gp.predict(X)
-            std = np.sqrt(var)
-            
-            # 确保标准差为正数
-            std = np.maximum(std, 1e-10)
-            
-            # 限制采样范围避免数值不稳定
-            mean = np.where(np.isfinite(mean), mean, 0.0)
-            std = np.where(np.isfinite(std), std, 1e-10)
-            
-            # 从正态分布采样
-            sample = np.random.normal(mean, std)
-            sample = np.where(np.isfinite(sample), sample, 0.0)
-            samples += sample
+        # GP posterior is deterministic for fixed X: predict once, then draw all samples in one call
+        mean, var = self.gp.predict(X)
+        std = np.sqrt(var)
+        
+        # 确保标准差为正数
+        std = np.maximum(std, 1e-10)
+        
+        # 限制采样范围避免数值不稳定
+        mean = np.where(np.isfinite(mean), mean, 0.0)
+        std = np.where(np.isfinite(std), std, 1e-10)
+        
+        # 从正态分布批量采样，形状为 (n_samples, n_points)
+        samples = np.random.normal(mean, std, size=(self.n_samples, mean.shape[0]))
+        samples = np.where(np.isfinite(samples), samples, 0.0)
 
         # For minimization: use negative of average samples
         # This way, points with lower sampled values get higher acquisition scores
         # Higher acquisition value = more promising for minimization
-        avg_samples = samples / self.n_samples
+        avg_samples = samples.mean(axis=0)
         avg_samples = np.where(np.isfinite(avg_samples), avg_samples, 0.0)
         
         return -avg_samples
@@ -372,15 +366,14 @@ class BayesianOptimizer:
         best_x = None
         best_acq = -np.inf
 
-        # Multi-start optimization
+        # Multi-start optimization, all random starting points drawn in one call
         n_restarts = 10
-        for _ in range(n_restarts):
-            # Random starting point
-            x0 = np.random.uniform(
-                low=[bound[0] for bound in self.bounds],
-                high=[bound[1] for bound in self.bounds]
-            )
-
+        starts = np.random.uniform(
+            low=[bound[0] for bound in self.bounds],
+            high=[bound[1] for bound in self.bounds],
+            size=(n_restarts, self.n_dimensions)
+        )
+        for x0 in starts:
             # All acquisition functions should be MAXIMIZED
             # They represent "how promising a point is to explore"
             def objective(x):
@@ -409,8 +402,14 @@ class BayesianOptimizer:
         return best_x
     
     def optimize(self, objective_function: Callable, max_evaluations: int = 50,
-                 verbose: bool = True, return_history: bool = True) -> Union[Tuple[np.ndarray, float], Tuple[np.ndarray, float, List]]:
-        """Execute Bayesian Optimization"""
+                 verbose: bool = True, return_history: bool = True,
+                 tol: Optional[float] = None) -> Union[Tuple[np.ndarray, float], Tuple[np.ndarray, float, List]]:
+        """Execute Bayesian Optimization
+
+        Non-finite scores (e.g. a failed FEM evaluation returning inf) are kept in
+        the history but never fed to the GP. When ``tol`` is given, the search
+        stops as soon as the best score drops below it.
+        """
         start_time = time.time()
 
         if verbose:
@@ -426,13 +425,17 @@ class BayesianOptimizer:
 
         for i, x in enumerate(X_init):
             y = objective_function(x)
-            self.gp.add_observation(x, y)
+            if np.isfinite(y):
+                self.gp.add_observation(x, y)
             self.X_history.append(x.copy())
             self.y_history.append(y)
 
             if verbose:
                 print(f"Init {i+1:2d}: f({x[0]:.4f}, {x[1]:.4f}) = {y:.6f}")
 
+            if tol is not None and y < tol:
+                break
+
         # Record initial best
         best_idx = np.argmin(self.y_history)
         self.best_y_history.append(self.y_history[best_idx])
@@ -444,9 +447,15 @@ class BayesianOptimizer:
         # Bayesian optimization loop
         total_iterations = max_evaluations - self.n_initial
         for iteration in range(total_iterations):
-            print("="*30, "尝试", iteration, "="*30)
             # Find current best
             y_best = min(self.y_history)
+            if tol is not None and y_best < tol:
+                if verbose:
+                    print(f"Best score {y_best:.3e} below tol {tol:.1e}, stopping early")
+                break
+
+            if verbose:
+                print("="*30, "尝试", iteration, "="*30)
 
             # Optimize acquisition function to get next point
             x_next = self._optimize_acquisition(y_best, iteration, total_iterations)
@@ -454,8 +463,9 @@ class BayesianOptimizer:
             # Evaluate objective function at next point
             y_next = objective_function(x_next)
 
-            # Update GP with new observation
-            self.gp.add_observation(x_next, y_next)
+            # Update GP with new observation (skip failed evaluations)
+            if np.isfinite(y_next):
+                self.gp.add_observation(x_next, y_next)
             self.X_history.append(x_next.copy())
             self.y_history.append(y_next)
 
@@ -525,6 +535,16 @@ def create_optimization_problem(x_range: Tuple[float, float] = (-2, 3), n_points
         predicted_values = quadratic_approximation(x_values, params)
         mse = np.mean((predicted_values - target_values)**2)
         return mse
+
+    def objective_function_batch(params: np.ndarray) -> np.ndarray:
+        """Vectorized objective for params of shape (N, 2); returns (N,) MSE values"""
+        params = np.atleast_2d(params)
+        # Broadcast the same model as the scalar objective: (N, 1) parameters against (n_points,) inputs
+        predicted_values = quadratic_approximation(x_values, params.T[..., None])
+        return np.mean((predicted_values - target_values)**2, axis=1)
+
+    # Batch twin for callers that evaluate many points at once (e.g. contour grids)
+    objective_function.batch = objective_function_batch
     
     return objective_function, x_values, target_values
 
@@ -711,11 +731,15 @@ def plot_comprehensive_contour(objective_function: Callable, optimizer: Bayesian
     
     # Calculate objective function values on grid
     print("Computing objective function landscape...")
-    Z = np.zeros_like(A)
-    for i in range(resolution):
-        for j in range(resolution):
-            params = np.array([A[i, j], B[i, j]])
-            Z[i, j] = objective_function(params)
+    batch_objective = getattr(objective_function, 'batch', None)
+    if batch_objective is not None:
+        Z = batch_objective(np.column_stack([A.ravel(), B.ravel()])).reshape(A.shape)
+    else:
+        Z = np.zeros_like(A)
+        for i in range(resolution):
+            for j in range(resolution):
+                params = np.array([A[i, j], B[i, j]])
+                Z[i, j] = objective_function(params)
     
     # Get optimization history
     X_history = np.array(optimizer.X_history)
@@ -11,6 +11,7 @@ import pickle
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple, Callable
 from datetime import datetime
+from functools import lru_cache
 import sys
 from scipy import ndimage
 from skimage.metrics import structural_similarity as ssim
@@ -25,6 +26,13 @@ except ImportError:
     VISUALIZATION_AVAILABLE = False
     print("⚠️ Matplotlib not available, visualization features will be disabled")
 
+# Numba为可选依赖：可用时误差归约走融合循环，否则退回NumPy实现
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # 添加必要的路径
 def add_calibration_path():
     """添加calibration目录到Python路径"""
@@ -52,6 +60,146 @@ except ImportError as e:
     sys.exit(1)
 
 
+# 物体STL模型目录的候选位置
+_OBJECT_SEARCH_PATHS = (
+    # Path("../xengym/assets/obj"),
+    # Path(__file__).parent.parent / "xengym" / "assets" / "obj",
+    # Path("/home/czl/Downloads/workspace/xengym/xengym/assets/obj"),
+    Path("/home/czl/Downloads/workspace/xengym/calibration/obj"),
+)
+
+
+@lru_cache(maxsize=8)
+def _stl_files(dir_str: str, mtime_ns: int) -> Tuple[Path, ...]:
+    """目录下的STL文件列表，按 (目录, mtime) 缓存，目录内容变化后自动失效"""
+    return tuple(Path(dir_str).glob("*.STL"))
+
+
+def _list_stl_files(path: Path) -> Tuple[Path, ...]:
+    """只做一次stat，目录未变化时不再重复读取目录"""
+    return _stl_files(str(path), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _locate_object_dir() -> Path:
+    """返回第一个存在且含有STL文件的候选目录；找到后缓存，未找到时抛出异常（异常不会被缓存）"""
+    for path in _OBJECT_SEARCH_PATHS:
+        if path.is_dir() and _list_stl_files(path):
+            return path
+    raise FileNotFoundError("未找到含STL文件的物体目录")
+
+
+def _find_object_dir() -> Optional[Path]:
+    """物体目录，未找到时返回 None；之后目录被创建/挂载时下次调用仍能找到"""
+    try:
+        return _locate_object_dir()
+    except FileNotFoundError:
+        return None
+
+
+# 误差权重：根据项目实际关注度可调整
+CALIBRATION_ERROR_WEIGHTS = {
+    'marker_displacement': 100,  # 标记位移场
+    'force_xyz': 10/3,           # 三维力
+}
+
+
+def _real_step_keys(real_data: Dict) -> List[Tuple[str, str, str]]:
+    """真实数据中全部 (object, trajectory, step) 键，按真实数据中的顺序排列"""
+    keys = []
+    for obj_name, real_obj in real_data.items():
+        if not isinstance(real_obj, dict):
+            continue
+        for traj_name, real_traj in real_obj.items():
+            if not isinstance(real_traj, dict):
+                continue
+            for step_name, real_step in real_traj.items():
+                if isinstance(real_step, dict):
+                    keys.append((obj_name, traj_name, step_name))
+    return keys
+
+
+def _step_field(data: Dict, key: Tuple[str, str, str], field: str):
+    """取 data[object][trajectory][step][field]，任一层缺失时返回 None"""
+    node = data
+    for name in key:
+        node = node.get(name) if isinstance(node, dict) else None
+    return node.get(field) if isinstance(node, dict) else None
+
+
+def _flatten_calibration(data: Dict, keys: List[Tuple[str, str, str]], field: str,
+                         out: Optional[np.ndarray] = None, size: Optional[int] = None):
+    """
+    按 keys 的顺序把每一步的 field 展平后堆叠为 (K, L) float32 数组
+
+    size 为每步期望的元素数 L；未指定时取各步中最常见的元素数，个别形状异常的步只影响自身。
+    out 形状匹配时直接写入该缓冲区（跨评估复用，避免重复分配）。
+
+    Returns:
+        (stack, present)：present[i] 表示第 i 步存在、含有该字段且元素数等于 L；
+        没有任何一步含该字段时返回 (None, None)
+    """
+    rows = [_step_field(data, key, field) for key in keys]
+    if size is None:
+        sizes = [np.size(r) for r in rows if r is not None]
+        if not sizes:
+            return None, None
+        values, counts = np.unique(sizes, return_counts=True)
+        size = int(values[np.argmax(counts)])
+
+    if out is not None and out.shape == (len(keys), size):
+        stack = out
+        stack.fill(np.nan)
+    else:
+        stack = np.full((len(keys), size), np.nan, dtype=np.float32)
+    present = np.zeros(len(keys), dtype=bool)
+    for i, row in enumerate(rows):
+        if row is not None and np.size(row) == size:
+            stack[i] = np.ravel(row)
+            present[i] = True
+    return stack, present
+
+
+if NUMBA_AVAILABLE:
+    # 不开启 nnan/ninf，保证 isfinite 判断不被优化掉
+    @njit(parallel=True, fastmath={'contract', 'reassoc', 'nsz', 'arcp'}, cache=True)
+    def _masked_row_sse(a, b, rows):
+        """逐行统计两侧都有限元素的平方误差和与个数，一次遍历、不生成中间数组"""
+        n, m = a.shape
+        sse = np.zeros(n)
+        count = np.zeros(n, dtype=np.int64)
+        for i in prange(n):
+            if not rows[i]:
+                continue
+            s = 0.0
+            c = 0
+            for j in range(m):
+                x = a[i, j]
+                y = b[i, j]
+                if np.isfinite(x) and np.isfinite(y):
+                    d = x - y
+                    s += d * d
+                    c += 1
+            sse[i] = s
+            count[i] = c
+        return sse, count
+else:
+    def _masked_row_sse(a, b, rows):
+        """逐行统计两侧都有限元素的平方误差和与个数"""
+        valid = np.isfinite(a) & np.isfinite(b) & rows[:, None]
+        diff = np.subtract(a, b)
+        diff[~valid] = 0.0
+        # float32 差值，float64 累加
+        return np.einsum('ij,ij->i', diff, diff, dtype=np.float64), valid.sum(axis=1)
+
+
+def _masked_row_rmse(a: np.ndarray, b: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """逐行RMSE，只统计两侧都有限的元素；无可比元素的行返回 NaN"""
+    sse, count = _masked_row_sse(a, b, rows)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, np.sqrt(sse / count), np.nan)
+
+
 class RealDataInterface:
     """真实数据导入接口"""
     
@@ -115,12 +263,17 @@ class RealDataInterface:
         print(f"✓ 从目录加载了 {len(combined_data)} 个物体的数据")
         return combined_data
     
-    def create_real_raw_data(self, E_true: float = 0.1983, nu_true: float = 0.4795, coef_true: float = 0.200) -> Dict:
-        """创建仿真真实数据（用于测试）"""
+    def create_real_raw_data(self, E_true: float = 0.1983, nu_true: float = 0.4795, coef_true: float = 0.200,
+                             scene=None) -> Dict:
+        """创建仿真真实数据（用于测试）
+
+        scene 可传入已创建的标定场景复用，避免重复加载STL、初始化仿真器；为 None 时新建。
+        """
         print(f"🎯 创建仿真真实数据 (E={E_true}, nu={nu_true}, coef={coef_true})")
         
         # 创建标定场景
-        scene = self._create_calibration_scene()
+        if scene is None:
+            scene = self._create_calibration_scene()
         if scene is None:
             raise RuntimeError("无法创建标定场景")
         
@@ -134,23 +287,9 @@ class RealDataInterface:
     
     def _create_calibration_scene(self):
         """创建标定场景"""
-        # 尝试多个可能的路径
-        possible_paths = [
-            # Path("../xengym/assets/obj"),
-            # Path(__file__).parent.parent / "xengym" / "assets" / "obj",
-            # Path("/home/czl/Downloads/workspace/xengym/xengym/assets/obj"),
-            Path("/home/czl/Downloads/workspace/xengym/calibration/obj")
-        ]
-        
-        object_files = []
-        for path in possible_paths:
-            if path.exists():
-                stl_files = list(path.glob("*.STL"))
-                # stl_files = list(path.glob("*.obj"))
-                if stl_files:
-                    object_files = [str(f) for f in stl_files[:4]]  
-                    break
-        
+        object_dir = _find_object_dir()
+        object_files = [str(f) for f in _list_stl_files(object_dir)[:4]] if object_dir else []
+
         if not object_files:
             print("❌ 无法找到STL文件")
             return None
@@ -179,7 +318,8 @@ class BayesianCalibration:
                  n_initial: int = 15,  # 增加初始样本数，适应3D参数空间
                  n_iterations: int = 30,  # 增加迭代次数
                  acquisition: str = 'adaptive',  # 添加采集函数选择
-                 xi: float = 0.01):  # 添加探索参数
+                 xi: float = 0.01,  # 添加探索参数
+                 verbose: bool = True):  # 是否逐次打印评估结果
         
         self.real_data_interface = real_data_interface
         self.E_bounds = E_bounds
@@ -189,6 +329,7 @@ class BayesianCalibration:
         self.n_iterations = n_iterations
         self.acquisition = acquisition
         self.xi = xi
+        self.verbose = verbose
         
         # 创建标定场景
         self.scene = real_data_interface._create_calibration_scene()
@@ -197,74 +338,66 @@ class BayesianCalibration:
         
         # 优化历史
         self.optimization_history = []
+
+        # 仿真数据堆叠的float32缓冲区，每次评估形状相同，跨评估复用：{字段: stack}
+        self._sim_scratch = {}
+
+        # 预先触发误差归约的JIT编译，避免首次评估时计入编译耗时
+        if NUMBA_AVAILABLE:
+            _masked_row_sse(np.zeros((1, 1), np.float32), np.zeros((1, 1), np.float32), np.ones(1, dtype=bool))
     
-    def calculate_calibration_error(self, sim_data: Dict, real_data: Dict) -> float:
+    def prepare_reference(self, real_data: Dict) -> Dict:
+        """
+        将真实数据按步骤键一次性堆叠为参考数组，供整个优化过程复用
+
+        Returns:
+            {'keys': 步骤键列表, 'fields': {字段: (stack, present)}}
+        """
+        keys = _real_step_keys(real_data)
+        fields = {field: _flatten_calibration(real_data, keys, field)
+                  for field in CALIBRATION_ERROR_WEIGHTS}
+        return {'keys': keys, 'fields': fields}
+
+    def calculate_calibration_error(self, sim_data: Dict, real_data: Dict,
+                                    reference: Optional[Dict] = None) -> float:
         """计算标定误差
         - 依据 traj.json 的层级结构对齐: object → trajectory → step
-        - 分别计算 marker/force/depth 的 RMSE
+        - 分别计算 marker/force 每一步的 RMSE（堆叠为连续数组后一次性计算）
         - 健壮处理缺失键、NaN、形状不一致
         - 以加权和归一化返回综合误差
+
+        reference 为 prepare_reference(real_data) 的结果；未提供时现场构建。
         """
-        def rmse(a: np.ndarray, b: np.ndarray) -> float:
-            a = np.asarray(a)
-            b = np.asarray(b)
-            # 对齐形状：仅当元素总数相等时允许 reshape
-            if a.shape != b.shape:
-                if a.size == b.size:
-                    b = b.reshape(a.shape)
-                else:
-                    # 形状完全不匹配，放弃该项评价
-                    return np.nan
-            mask = np.isfinite(a) & np.isfinite(b)
-            if not np.any(mask):
-                return np.nan
-            diff = a[mask] - b[mask]
-            return float(np.sqrt(np.mean(diff ** 2)))
-        
+        if reference is None:
+            reference = self.prepare_reference(real_data)
+        keys = reference['keys']
+
         total_error = 0.0
         total_weight = 0.0
-        
-        # 权重：根据项目实际关注度可调整
-        weight_marker = 100   # 标记位移场
-        weight_force = 10/3    # 三维力
-        
-        # 遍历两侧共同包含的对象/轨迹/步
-        for obj_name in real_data.keys() & sim_data.keys():
-            real_obj = real_data[obj_name]
-            sim_obj = sim_data[obj_name]
-            if not isinstance(real_obj, dict) or not isinstance(sim_obj, dict):
+
+        for field, weight in CALIBRATION_ERROR_WEIGHTS.items():
+            real_stack, real_present = reference['fields'][field]
+            if real_stack is None:
                 continue
-            for traj_name in real_obj.keys() & sim_obj.keys():
-                real_traj = real_obj[traj_name]
-                sim_traj = sim_obj[traj_name]
-                if not isinstance(real_traj, dict) or not isinstance(sim_traj, dict):
-                    continue
-                for step_name in real_traj.keys() & sim_traj.keys():
-                    real_step = real_traj.get(step_name, {}) or {}
-                    sim_step = sim_traj.get(step_name, {}) or {}
-                    if not isinstance(real_step, dict) or not isinstance(sim_step, dict):
-                        continue
-                    
-                    # 1) Marker 位移误差 (HxWx2)
-                    if 'marker_displacement' in real_step and 'marker_displacement' in sim_step:
-                        marker_err = rmse(real_step['marker_displacement'], sim_step['marker_displacement'])
-                        if np.isfinite(marker_err):
-                            total_error += weight_marker * marker_err
-                            total_weight += weight_marker
-                    
-                    # 2) 力误差 (3,)
-                    if 'force_xyz' in real_step and 'force_xyz' in sim_step:
-                        force_err = rmse(real_step['force_xyz'], sim_step['force_xyz'])
-                        if np.isfinite(force_err):
-                            total_error += weight_force * force_err
-                            total_weight += weight_force
-        
+            # 仿真侧按真实数据的键顺序、以真实数据的每步元素数堆叠；缺失或形状不符的步骤 present 为 False
+            sim_stack, sim_present = _flatten_calibration(sim_data, keys, field, out=self._sim_scratch.get(field),
+                                                          size=real_stack.shape[1])
+            if sim_stack is None:
+                continue
+            self._sim_scratch[field] = sim_stack
+
+            row_rmse = _masked_row_rmse(real_stack, sim_stack, real_present & sim_present)
+            row_rmse = row_rmse[np.isfinite(row_rmse)]
+            total_error += weight * float(row_rmse.sum())
+            total_weight += weight * row_rmse.size
+
         if total_weight <= 0:
             # 无可比较项时返回一个大值，避免误导优化
             return float('inf')
         return total_error / total_weight
-    
-    def objective_function(self, params: np.ndarray, real_data: Dict) -> float:
+
+    def objective_function(self, params: np.ndarray, real_data: Dict,
+                           reference: Optional[Dict] = None) -> float:
         """目标函数 - 使用改进的误差计算方法"""
         E, nu, coef = params
         
@@ -273,8 +406,9 @@ class BayesianCalibration:
             sim_data = self.scene.calibrate_with_parameters(E, nu, coef)
             
             # 计算综合误差
-            error = self.calculate_calibration_error(sim_data, real_data)
-            print(f"   参数 E={E:.4f}, nu={nu:.4f}, coef={coef:.3f}, 综合误差={error:.6f}")
+            error = self.calculate_calibration_error(sim_data, real_data, reference)
+            if self.verbose:
+                print(f"   参数 E={E:.4f}, nu={nu:.4f}, coef={coef:.3f}, 综合误差={error:.6f}")
 
             return error
             
@@ -299,13 +433,16 @@ class BayesianCalibration:
                 return None
             
             # 使用仿真真实数据
-            real_data = self.real_data_interface.create_real_raw_data(E_true, nu_true, coef_true)
+            real_data = self.real_data_interface.create_real_raw_data(E_true, nu_true, coef_true, scene=self.scene)
         
         print(f"✓ 真实数据包含 {len(real_data)} 个物体")
         
+        # 真实数据只堆叠一次，目标函数闭包复用
+        reference = self.prepare_reference(real_data)
+
         # 创建目标函数
         def objective(params):
-            return self.objective_function(params, real_data)
+            return self.objective_function(params, real_data, reference)
         
         # 设置参数边界
         bounds = [
@@ -336,7 +473,8 @@ class BayesianCalibration:
         best_params, best_score, optimization_history = optimizer.optimize(
             objective_function=objective,
             max_evaluations=self.n_initial + self.n_iterations,
-            verbose=True
+            verbose=self.verbose,
+            tol=1e-8
         )
         
         # 保存优化历史
@@ -598,6 +736,12 @@ class BayesianCalibration:
         if not VISUALIZATION_AVAILABLE:
             print("⚠️ Matplotlib not available, skipping real-time visualization")
             return
+
+        if real_data is None:
+            if E_true is None or nu_true is None:
+                print("❌ 需要提供真实数据或真实参数")
+                return None
+            real_data = self.real_data_interface.create_real_raw_data(E_true, nu_true, coef_true, scene=self.scene)
         
         # Setup the figure with 2x3 layout for 3 parameters
         fig = plt.figure(figsize=(15, 10))
@@ -619,8 +763,10 @@ class BayesianCalibration:
         self.real_time_best_scores = []
         
         # Wrap the objective function to capture data
+        reference = self.prepare_reference(real_data)
+
         def tracked_objective(params):
-            score = self.objective_function(params, real_data)
+            score = self.objective_function(params, real_data, reference)
             
             # Store data
             self.real_time_iterations.append(len(self.real_time_iterations))
@@ -657,7 +803,8 @@ class BayesianCalibration:
         best_params, best_score, optimization_history = optimizer.optimize(
             objective_function=objective,
             max_evaluations=self.n_initial + self.n_iterations,
-            verbose=True
+            verbose=self.verbose,
+            tol=1e-8
         )
         
         # Final plot update
@@ -934,6 +1081,8 @@ def main():
                        help='Acquisition function for Bayesian optimization')
     parser.add_argument('--xi', type=float, default=0.01,
                        help='Exploration parameter for acquisition function')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Do not print every objective evaluation')
     
     args = parser.parse_args()
     
@@ -949,7 +1098,8 @@ def main():
         n_initial=args.n_initial,
         n_iterations=args.n_iterations,
         acquisition=args.acquisition,  # 使用命令行指定的采集函数
-        xi=args.xi  # 使用命令行指定的探索参数
+        xi=args.xi,  # 使用命令行指定的探索参数
+        verbose=not args.quiet
     )
     
     # 检查是否有真实数据
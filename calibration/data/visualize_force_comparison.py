@@ -68,6 +68,10 @@ class ForceAndMarkerVisualizer:
         
         self.current_trajectory = self.trajectories[self.current_object][0] if self.trajectories[self.current_object] else None
         
+        # Pre-parse Z-force curves once so GUI callbacks only do dict lookups
+        self._force_cache = self._build_force_cache()
+        self._fit_cache: Dict[Tuple[str, str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        
         # Setup the plot
         self.setup_plot()
         
@@ -99,32 +103,51 @@ class ForceAndMarkerVisualizer:
         
         return np.stack([X, Y], axis=2)
     
-    def extract_force_z(self, data: Dict, obj: str, traj: str) -> Tuple[np.ndarray, np.ndarray]:
-        """Extract force_xyz[2] values and step numbers"""
-        if obj not in data or traj not in data[obj]:
+    def _build_force_cache(self) -> Dict[Tuple[str, str, str], Tuple[np.ndarray, np.ndarray]]:
+        """Build contiguous (steps, force_z) arrays for every (object, trajectory, source)"""
+        cache = {}
+        for source, data in (('real', self.real_data), ('sim', self.sim_data)):
+            for obj, obj_data in data.items():
+                if not isinstance(obj_data, dict):
+                    continue
+                for traj, traj_data in obj_data.items():
+                    # A malformed trajectory only loses its own plot instead of aborting startup
+                    try:
+                        cache[(obj, traj, source)] = self._parse_force_z(traj_data)
+                    except Exception as e:
+                        print(f"Skipping force data for {source} {obj}/{traj}: {e}")
+        return cache
+    
+    @staticmethod
+    def _step_number(key) -> Optional[int]:
+        """Step index from a 'step_XXX' key, or None if the key is not of that form"""
+        try:
+            return int(str(key).rsplit('_', 1)[1])
+        except (IndexError, ValueError):
+            return None
+    
+    @staticmethod
+    def _parse_force_z(traj_data: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Parse force_xyz[2] of steps 0-9, shifted by one with a leading zero-force point"""
+        entries = []
+        for key, value in traj_data.items():
+            step = ForceAndMarkerVisualizer._step_number(key)
+            if step is not None and isinstance(value, dict) and 'force_xyz' in value:
+                entries.append((step, key))
+        entries.sort()
+        steps = np.fromiter((step for step, _ in entries), dtype=np.int32, count=len(entries))
+        forces = np.fromiter((traj_data[k]['force_xyz'][2] for _, k in entries), dtype=np.float32, count=len(entries))
+        
+        keep = steps <= 9
+        if not np.any(keep):
             return np.array([]), np.array([])
         
-        traj_data = data[obj][traj]
-        steps = []
-        forces = []
-        
-        for step_key in sorted(traj_data.keys()):
-            step_data = traj_data[step_key]
-            if 'force_xyz' in step_data:
-                force_z = step_data['force_xyz'][2]
-                step_num = int(step_key.split('_')[-1])
-                
-                if step_num <= 9:
-                    steps.append(step_num)
-                    forces.append(float(force_z))
-        
-        if len(steps) > 0:
-            # Add step 0 with 0 force
-            steps = np.array([0] + [s + 1 for s in steps])
-            forces = np.array([0.0] + forces)
-            return steps, forces
-        else:
-            return np.array([]), np.array([])
+        # Add step 0 with 0 force
+        return np.concatenate(([0], steps[keep] + 1)), np.concatenate(([0.0], forces[keep]))
+    
+    def extract_force_z(self, source: str, obj: str, traj: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract force_xyz[2] values and step numbers ('real' or 'sim' source)"""
+        return self._force_cache.get((obj, traj, source), (np.array([]), np.array([])))
     
     def extract_marker_displacement(self, data: Dict, obj: str, traj: str, step: int) -> Optional[np.ndarray]:
         """Extract marker displacement for a specific step"""
@@ -164,6 +187,13 @@ class ForceAndMarkerVisualizer:
         except:
             return x, y
     
+    def get_fitted_curve(self, source: str, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Fitted curve for the current object/trajectory, computed once per source"""
+        key = (self.current_object, self.current_trajectory, source)
+        if key not in self._fit_cache:
+            self._fit_cache[key] = self.fit_curve(x, y)
+        return self._fit_cache[key]
+    
     def setup_plot(self):
         """Setup the matplotlib figure and widgets"""
         self.fig = plt.figure(figsize=(16, 9), constrained_layout=False)
@@ -327,10 +357,10 @@ class ForceAndMarkerVisualizer:
         
         try:
             real_steps, real_forces = self.extract_force_z(
-                self.real_data, self.current_object, self.current_trajectory
+                'real', self.current_object, self.current_trajectory
             )
             sim_steps, sim_forces = self.extract_force_z(
-                self.sim_data, self.current_object, self.current_trajectory
+                'sim', self.current_object, self.current_trajectory
             )
             
             if len(real_steps) == 0 and len(sim_steps) == 0:
@@ -347,7 +377,7 @@ class ForceAndMarkerVisualizer:
                           label='Real Data', zorder=3)
                 
                 if len(real_steps) >= 2:
-                    x_fit, y_fit = self.fit_curve(real_steps, real_forces)
+                    x_fit, y_fit = self.get_fitted_curve('real', real_steps, real_forces)
                     ax.plot(x_fit, y_fit, '#2196F3', 
                             linewidth=3, alpha=0.8,
                             label='Real Fitted')
@@ -360,7 +390,7 @@ class ForceAndMarkerVisualizer:
                           label='Sim Data', zorder=3)
                 
                 if len(sim_steps) >= 2:
-                    x_fit, y_fit = self.fit_curve(sim_steps, sim_forces)
+                    x_fit, y_fit = self.get_fitted_curve('sim', sim_steps, sim_forces)
                     ax.plot(x_fit, y_fit, '#F44336', 
                             linewidth=3, alpha=0.8, linestyle='--',
                             label='Sim Fitted')
@@ -179,11 +179,100 @@ class RealCalibrationDataVisualizer:
         # Create buttons
         self.create_buttons()
 
+        # Persistent artists for the main plot (updated in place, blitted on change)
+        self.init_main_artists()
+
         # Plot initial data
         self.update_plot()
 
         plt.tight_layout()
 
+    def init_main_artists(self):
+        """Create the static decorations and animated artist pools of the main plot"""
+        self.ax_main.set_xlabel('Step Number (starting from 1)', fontsize=12, fontweight='bold')
+        self.ax_main.set_ylabel('Z-Force (N)', fontsize=12, fontweight='bold')
+        self.ax_main.grid(True, alpha=0.3, linestyle='--')
+
+        # Add vertical line at x=0 to highlight y-intercept
+        self.ax_main.axvline(x=0, color='gray', linestyle='--', alpha=0.5)
+
+        # Add text annotation for y-intercept line
+        self.ax_main.text(0.02, 0.98, 'Y-axis intercept (x=0)',
+                          transform=self.ax_main.transAxes,
+                          fontsize=9, verticalalignment='top',
+                          bbox=dict(boxstyle='round,pad=0.3',
+                                    facecolor='lightgray', alpha=0.5))
+
+        self._status_text = self.ax_main.text(0.5, 0.5, '',
+                                              ha='center', va='center', transform=self.ax_main.transAxes,
+                                              fontsize=14, animated=True, visible=False)
+        self._edit_text = self.ax_main.text(0.98, 0.02,
+                                            'Edit Mode: Select runs in left panel and click "Delete Selected"',
+                                            transform=self.ax_main.transAxes,
+                                            fontsize=9, horizontalalignment='right',
+                                            bbox=dict(boxstyle='round,pad=0.3',
+                                                      facecolor='yellow', alpha=0.5),
+                                            animated=True, visible=False)
+
+        # One (points, fitted line, intercept marker, intercept label) group per run, grown on demand
+        self._run_artists = []
+        self._legend = None
+        self._main_bg = None
+        self._main_layout = None
+
+        self.fig.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def _get_run_artists(self, i: int):
+        """Return the artist group for the i-th run, creating it if needed"""
+        while len(self._run_artists) <= i:
+            points, = self.ax_main.plot([], [], linestyle='None', markersize=8,
+                                        markeredgecolor='black', markeredgewidth=1,
+                                        zorder=3, animated=True)
+            fitted, = self.ax_main.plot([], [], linewidth=2, animated=True)
+            intercept, = self.ax_main.plot([], [], linestyle='None', markersize=8,
+                                           markeredgecolor='black', markeredgewidth=1.5,
+                                           zorder=4, animated=True)
+            label = self.ax_main.annotate('', xy=(0, 0),
+                                          xytext=(5, 5), textcoords='offset points',
+                                          fontsize=8,
+                                          bbox=dict(boxstyle='round,pad=0.3',
+                                                    facecolor='white', alpha=0.7),
+                                          animated=True)
+            self._run_artists.append((points, fitted, intercept, label))
+        return self._run_artists[i]
+
+    def _animated_main_artists(self) -> List:
+        """All animated artists of the main plot, in drawing order"""
+        artists = [a for group in self._run_artists for a in group]
+        artists += [self._status_text, self._edit_text]
+        if self._legend is not None:
+            artists.append(self._legend)
+        return artists
+
+    def on_draw(self, event):
+        """Cache the main plot background after a full redraw and paint the animated artists on top"""
+        if not self.fig.canvas.supports_blit:
+            return
+        self._main_bg = self.fig.canvas.copy_from_bbox(self.ax_main.bbox)
+        for artist in self._animated_main_artists():
+            self.ax_main.draw_artist(artist)
+
+    def blit_main(self):
+        """Repaint only the main plot from the cached background; fall back to a full redraw"""
+        canvas = self.fig.canvas
+        layout = (self.ax_main.get_xlim(), self.ax_main.get_ylim(), self.ax_main.get_title())
+
+        if self._main_bg is None or layout != self._main_layout or not canvas.supports_blit:
+            # Ticks or title changed: the cached background is stale
+            self._main_layout = layout
+            canvas.draw_idle()
+            return
+
+        canvas.restore_region(self._main_bg)
+        for artist in self._animated_main_artists():
+            self.ax_main.draw_artist(artist)
+        canvas.blit(self.ax_main.bbox)
+
     def update_trajectory_buttons(self):
         """Update trajectory radio buttons based on current object"""
         self.ax_trajectory.clear()
@@ -253,14 +342,14 @@ class RealCalibrationDataVisualizer:
         self.current_object = label
         self.update_trajectory_buttons()
         self.update_plot()
-        plt.draw()
+        self.fig.canvas.draw_idle()
 
     def on_trajectory_change(self, label):
         """Callback when trajectory selection changes"""
         self.current_trajectory = label
         self.update_run_checkboxes()
         self.update_plot()
-        plt.draw()
+        self.fig.canvas.draw_idle()
 
     def on_run_select(self, label):
         """Callback when run checkbox is clicked"""
@@ -277,6 +366,7 @@ class RealCalibrationDataVisualizer:
         if label in runs:
             idx = runs.index(label)
             self.selected_runs[self.current_trajectory][idx] = not self.selected_runs[self.current_trajectory][idx]
+            self.update_plot()
 
     def toggle_edit_mode(self, event):
         """Toggle edit mode"""
@@ -291,7 +381,8 @@ class RealCalibrationDataVisualizer:
                 self.selected_runs[traj] = [False] * len(self.selected_runs[traj])
             self.update_run_checkboxes()
 
-        plt.draw()
+        self.update_plot()
+        self.fig.canvas.draw_idle()
 
     def delete_selected_runs(self, event):
         """Delete selected runs from data and renumber remaining runs"""
@@ -375,7 +466,7 @@ class RealCalibrationDataVisualizer:
         self.selected_runs[self.current_trajectory] = [False] * len(runs)
         self.update_run_checkboxes()
         self.update_plot()
-        plt.draw()
+        self.fig.canvas.draw_idle()
 
     def save_data(self, event):
         """Save modified data back to file"""
@@ -393,29 +484,44 @@ class RealCalibrationDataVisualizer:
             self.selected_runs = {}
             self.update_run_checkboxes()
             self.update_plot()
-            plt.draw()
+            self.fig.canvas.draw_idle()
             print("Data refreshed from file")
         except Exception as e:
             print(f"Error refreshing data: {e}")
 
     def update_plot(self):
-        """Update the main plot with current selection"""
-        self.ax_main.clear()
-
-        if self.current_trajectory is None:
-            self.ax_main.text(0.5, 0.5, 'No trajectory selected',
-                            ha='center', va='center', transform=self.ax_main.transAxes,
-                            fontsize=14)
-            return
+        """Update the main plot artists with the current selection and blit them"""
+        for group in self._run_artists:
+            for artist in group:
+                artist.set_visible(False)
+            group[0].set_data([], [])
+            group[1].set_data([], [])
+            group[2].set_data([], [])
+
+        if self._legend is not None:
+            self._legend.remove()
+            self._legend = None
+
+        self._status_text.set_visible(False)
+        self._edit_text.set_visible(self.edit_mode)
+
+        title = ''
+        if self.current_trajectory is not None:
+            title = f'Force Data: {self.current_object} - {self.current_trajectory}'
+            if self.edit_mode:
+                title += ' [EDIT MODE]'
+        self.ax_main.set_title(title, fontsize=14, fontweight='bold', pad=15)
 
         try:
+            if self.current_trajectory is None:
+                self._show_status('No trajectory selected')
+                return
+
             # Extract force data for all runs of this trajectory
             runs_data = self.extract_force_z(self.current_object, self.current_trajectory)
 
             if not runs_data:
-                self.ax_main.text(0.5, 0.5, 'No force data available for this trajectory',
-                                ha='center', va='center', transform=self.ax_main.transAxes,
-                                fontsize=14)
+                self._show_status('No force data available for this trajectory')
                 return
 
             # Color map for different runs
@@ -427,9 +533,12 @@ class RealCalibrationDataVisualizer:
                 if traj_key.startswith(self.current_trajectory + "_run"):
                     runs.append(traj_key)
 
+            handles = []
+
             # Plot each run
             for i, (run_name, (steps, forces)) in enumerate(runs_data.items()):
                 color = colors[i % len(colors)]
+                points, fitted, intercept, label = self._get_run_artists(i)
 
                 # Check if this run is selected for deletion
                 is_selected = False
@@ -443,74 +552,60 @@ class RealCalibrationDataVisualizer:
                 linestyle = '--' if is_selected else '-'
                 marker = 'x' if is_selected else 'o'
 
-                # Plot data points
-                self.ax_main.scatter(steps, forces,
-                                   c=[color], s=60, alpha=alpha,
-                                   edgecolors='black', linewidth=1,
-                                   marker=marker,
-                                   label=f'{run_name} Data', zorder=3)
+                # Data points
+                points.set_data(steps, forces)
+                points.set_marker(marker)
+                points.set_markerfacecolor(color)
+                points.set_alpha(alpha)
+                points.set_label(f'{run_name} Data')
+                points.set_visible(True)
+                handles.append(points)
 
-                # Fit and plot curve
+                # Fitted curve
                 if len(steps) >= 2:
                     x_fit, y_fit, y_intercept = self.fit_curve(steps, forces)
-                    self.ax_main.plot(x_fit, y_fit, linestyle,
-                                    color=color, linewidth=2, alpha=alpha,
-                                    label=f'{run_name} Fitted')
+                    fitted.set_data(x_fit, y_fit)
+                    fitted.set_linestyle(linestyle)
+                    fitted.set_color(color)
+                    fitted.set_alpha(alpha)
+                    fitted.set_label(f'{run_name} Fitted')
+                    fitted.set_visible(True)
+                    handles.append(fitted)
 
                     # Mark y-intercept (x=0)
-                    self.ax_main.plot(0, y_intercept, marker,
-                                    color=color, markersize=8,
-                                    markeredgecolor='black', markeredgewidth=1.5,
-                                    zorder=4)
-
-                    # Add annotation for y-intercept
-                    self.ax_main.annotate(f'{y_intercept:.3f}',
-                                         xy=(0, y_intercept),
-                                         xytext=(5, 5), textcoords='offset points',
-                                         fontsize=8, color=color,
-                                         bbox=dict(boxstyle='round,pad=0.3',
-                                                  facecolor='white', alpha=0.7))
-
-            # Formatting
-            self.ax_main.set_xlabel('Step Number (starting from 1)', fontsize=12, fontweight='bold')
-            self.ax_main.set_ylabel('Z-Force (N)', fontsize=12, fontweight='bold')
+                    intercept.set_data([0], [y_intercept])
+                    intercept.set_marker(marker)
+                    intercept.set_color(color)
+                    intercept.set_visible(True)
 
-            title = f'Force Data: {self.current_object} - {self.current_trajectory}'
-            if self.edit_mode:
-                title += ' [EDIT MODE]'
-            self.ax_main.set_title(title, fontsize=14, fontweight='bold', pad=15)
+                    # Annotation for y-intercept
+                    label.xy = (0, y_intercept)
+                    label.set_text(f'{y_intercept:.3f}')
+                    label.set_color(color)
+                    label.set_visible(True)
 
             # Add legend with smaller font
-            self.ax_main.legend(loc='best', fontsize=8, framealpha=0.9, ncol=2)
-            self.ax_main.grid(True, alpha=0.3, linestyle='--')
+            self._legend = self.ax_main.legend(handles=handles, loc='best', fontsize=8, framealpha=0.9, ncol=2)
+            self._legend.set_animated(True)
 
-            # Set X-axis to start from 0 to show y-intercept
+            # Rescale to the new data, keeping X-axis from 0 to show y-intercept
+            self.ax_main.relim()
+            self.ax_main.autoscale_view()
             x_min, x_max = self.ax_main.get_xlim()
             self.ax_main.set_xlim(0, max(x_max, 5))  # Ensure at least some range
 
-            # Add vertical line at x=0 to highlight y-intercept
-            self.ax_main.axvline(x=0, color='gray', linestyle='--', alpha=0.5)
-
-            # Add text annotation for y-intercept line
-            self.ax_main.text(0.02, 0.98, 'Y-axis intercept (x=0)',
-                             transform=self.ax_main.transAxes,
-                             fontsize=9, verticalalignment='top',
-                             bbox=dict(boxstyle='round,pad=0.3',
-                                      facecolor='lightgray', alpha=0.5))
-
-            # Add edit mode instructions
-            if self.edit_mode:
-                self.ax_main.text(0.98, 0.02,
-                                 'Edit Mode: Select runs in left panel and click "Delete Selected"',
-                                 transform=self.ax_main.transAxes,
-                                 fontsize=9, horizontalalignment='right',
-                                 bbox=dict(boxstyle='round,pad=0.3',
-                                          facecolor='yellow', alpha=0.5))
-
         except Exception as e:
-            self.ax_main.text(0.5, 0.5, f'Error loading data:\n{str(e)}',
-                            ha='center', va='center', transform=self.ax_main.transAxes,
-                            fontsize=12, color='red')
+            self._show_status(f'Error loading data:\n{str(e)}', color='red', fontsize=12)
+        finally:
+            self.blit_main()
+
+    def _show_status(self, message: str, color: str = 'black', fontsize: int = 14):
+        """Show a centered status message instead of run data"""
+        self._status_text.set_text(message)
+        self._status_text.set_color(color)
+        self._status_text.set_fontsize(fontsize)
+        self._status_text.set_visible(True)
+        self._edit_text.set_visible(False)
 
     def show(self):
         """Display the interactive plot"""
@@ -13,6 +13,7 @@ import pickle
 import hashlib
 from concurrent.futures import ThreadPoolExecutor
 import multiprocessing as mp
+from typing import Any, NamedTuple
 
 # 定义face_normal函数替代ezgl.items.MeshData中的函数
 def face_normal(v1, v2, v3):
@@ -47,6 +48,45 @@ os.chdir(program_dir)
 
 from Function import *
 
+
+class RawData(NamedTuple):
+    """
+    FEM原始数据（几何 + 材料），字段按属性访问，不再每次合并成新dict
+
+    保留 keys()/get()/data['key'] 接口，兼容按字典方式读取的旧代码。
+    """
+    node: np.ndarray
+    elements: np.ndarray
+    top_nodes: np.ndarray
+    bot_nodes: np.ndarray
+    mesh_shape: np.ndarray
+    top_indices: np.ndarray
+    top_vert_indices: np.ndarray
+    E: Any
+    nu: Any
+    KF_data: np.ndarray
+    KF_indices: np.ndarray
+    KF_indptr: np.ndarray
+    KF_shape: Any
+
+    def keys(self):
+        return self._fields
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._fields else default
+
+
 class FEMProcessor:
     """
     FEM处理器 - 支持动态材料参数
@@ -301,14 +341,33 @@ class FEMProcessor:
         return np.where(np.abs(self.node[:,2] - MinZ) < 1e-6)[0] + 1
     
     def Fix_matrix(self, matrix):
-        """添加底部结点位移约束"""
-        m = matrix.copy().tocsr()
-        for i in self.Bot:
-            for j in range(3):
-                n = 3 * (i - 1) + j
-                m.data[m.indptr[n]:m.indptr[n+1]] = 0
-                m[n, n] = 1
-        return m.tocsr()
+        """添加底部结点位移约束：约束自由度所在行清零、对角元置1（批量操作CSR数组）"""
+        m = matrix.tocsr(copy=True)
+        n_rows = m.shape[0]
+
+        fixed = np.zeros(n_rows, dtype=bool)
+        fixed[(3 * (np.asarray(self.Bot) - 1)[:, None] + np.arange(3)).ravel()] = True
+
+        # 每个非零元所在的行号
+        entry_rows = np.repeat(np.arange(n_rows), np.diff(m.indptr))
+        fixed_entries = fixed[entry_rows]
+        m.data[fixed_entries] = 0
+
+        diag_entries = fixed_entries & (m.indices == entry_rows)
+        m.data[diag_entries] = 1
+
+        # 结构上缺少对角元的约束行：以COO追加这些对角元后一次性转回CSR（不会丢掉已清零的显式元素）
+        missing = fixed.copy()
+        missing[entry_rows[diag_entries]] = False
+        if missing.any():
+            missing_rows = np.flatnonzero(missing)
+            coo = m.tocoo()
+            m = sp.sparse.coo_matrix(
+                (np.concatenate((coo.data, np.ones(missing_rows.size, dtype=m.dtype))),
+                 (np.concatenate((coo.row, missing_rows)), np.concatenate((coo.col, missing_rows)))),
+                shape=m.shape
+            ).tocsr()
+        return m
     
     def save_geometry_data(self, name=None):
         """保存几何信息"""
@@ -409,10 +468,10 @@ class FEMProcessor:
         self.save_material_data(name)
 
     def get_data(self, name="data"):
-        """获取完整数据"""
+        """获取完整数据，返回 RawData"""
         geometry_data = FEMProcessor.load_geometry_data(name)
         material_data = FEMProcessor.load_material_data(name)
-        return {**geometry_data, **material_data}
+        return RawData(**geometry_data, **material_data)
     
 
 def process_gel_data(name, dir_name=None, E=0.1983, nu=0.4795, use_cache=True, cache_dir=None):
@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+CALIBRATION_DIR = Path(__file__).resolve().parent.parent / "calibration"
+
+
+@pytest.fixture(scope="module")
+def bayesian_demo():
+    sys.path.insert(0, str(CALIBRATION_DIR))
+    try:
+        import bayesian_demo
+    finally:
+        sys.path.remove(str(CALIBRATION_DIR))
+    return bayesian_demo
+
+
+def test_objective_function_batch_matches_scalar(bayesian_demo):
+    objective_function, _, _ = bayesian_demo.create_optimization_problem()
+    params = np.random.default_rng(0).uniform(-5, 5, size=(16, 2))
+
+    batch = objective_function.batch(params)
+
+    assert batch.shape == (len(params),)
+    np.testing.assert_allclose(batch, [objective_function(p) for p in params], rtol=1e-12)
+
+
+def test_objective_function_batch_accepts_single_point(bayesian_demo):
+    objective_function, _, _ = bayesian_demo.create_optimization_problem()
+    point = np.array([1.5, -0.25])
+
+    np.testing.assert_allclose(objective_function.batch(point), [objective_function(point)], rtol=1e-12)
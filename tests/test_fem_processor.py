@@ -0,0 +1,66 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sp = pytest.importorskip("scipy.sparse")
+pytest.importorskip("matplotlib")
+pytest.importorskip("tqdm")
+
+CALIBRATION_DIR = Path(__file__).resolve().parent.parent / "calibration"
+
+
+@pytest.fixture(scope="module")
+def fem_processor():
+    # fem_processor 导入时会 chdir 到 calibration 目录并依赖同目录的 Function 模块
+    cwd = os.getcwd()
+    sys.path.insert(0, str(CALIBRATION_DIR))
+    try:
+        import fem_processor
+    finally:
+        os.chdir(cwd)
+        sys.path.remove(str(CALIBRATION_DIR))
+    return fem_processor
+
+
+def _reference_fix(matrix, bot):
+    """逐行的参考实现：约束行清零、对角元置1"""
+    m = matrix.tolil(copy=True)
+    for node in bot:
+        for k in range(3):
+            row = 3 * (node - 1) + k
+            m[row, :] = 0
+            m[row, row] = 1
+    return m.tocsr()
+
+
+def _make_processor(fem_processor, bot):
+    processor = object.__new__(fem_processor.FEMProcessor)
+    processor.Bot = bot
+    return processor
+
+
+def test_fix_matrix_with_stored_diagonal(fem_processor):
+    matrix = sp.random(12, 12, density=0.4, random_state=0, format="csr") + sp.eye(12, format="csr")
+    processor = _make_processor(fem_processor, [2, 4])
+
+    fixed = processor.Fix_matrix(matrix)
+
+    np.testing.assert_allclose(fixed.toarray(), _reference_fix(matrix, [2, 4]).toarray())
+
+
+def test_fix_matrix_with_missing_diagonal(fem_processor):
+    dense = np.arange(1, 145, dtype=float).reshape(12, 12)
+    np.fill_diagonal(dense, 0)
+    matrix = sp.csr_matrix(dense)
+    assert matrix.diagonal().max() == 0  # 对角元在结构上不存在
+    processor = _make_processor(fem_processor, [1, 3])
+
+    fixed = processor.Fix_matrix(matrix)
+
+    np.testing.assert_allclose(fixed.toarray(), _reference_fix(matrix, [1, 3]).toarray())
+    assert fixed.shape == matrix.shape
+    # 原矩阵不被修改
+    assert matrix.diagonal().max() == 0
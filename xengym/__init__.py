@@ -2,5 +2,15 @@ from pathlib import Path
 PROJ_DIR = Path(__file__).resolve().parent
 ASSET_DIR = PROJ_DIR / "assets"
 
-from .render.robotScene import RobotScene as Xensim
-from .main import main
\ No newline at end of file
+from .main import main
+
+__all__ = ["Xensim", "main", "PROJ_DIR", "ASSET_DIR"]
+
+
+def __getattr__(name):
+    # 渲染栈（genesis / OpenGL）只在首次访问 Xensim 时加载，只用到 PROJ_DIR 等常量的脚本不受影响
+    if name == "Xensim":
+        from .render.robotScene import RobotScene
+        globals()[name] = RobotScene
+        return RobotScene
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
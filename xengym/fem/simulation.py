@@ -309,7 +309,7 @@ class FEMSimulator:
             axis = 1
         ).reshape(-1, 3).astype(dtype=np.int32)  # 转换成三角形索引
 
-        node_xyz = data['node']  # (n_nodes, 3)  节点坐标
+        node_xyz = np.array(data['node'])  # (n_nodes, 3)  节点坐标，拷贝一份以免修改传入的 raw_data
         node_y_min = np.min(node_xyz[:, 1])
         node_xyz[:, 1] -= node_y_min  # NOTE 将节点坐标 y 平移到 0, 方便后续处理
         mesh_shpae = data.get('mesh_shape', None)  # (行数, 列数), gelpad mesh 的形状, 如果没有则从文件名中解析
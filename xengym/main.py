@@ -1,11 +1,11 @@
 import numpy as np
 
-from xensesdk.ezgl import tb, Matrix4x4
-from xensesdk.ezgl.utils.QtTools import qtcv
-from .render.robotScene import RobotScene
-
 
 def main(args):
+    # 渲染栈在调用时才导入，import xengym 不会因导出 main 而加载 genesis / OpenGL
+    from xensesdk.ezgl import tb, Matrix4x4
+    from xensesdk.ezgl.utils.QtTools import qtcv
+    from .render.robotScene import RobotScene
     
     if not args.show_left and not args.show_right:
         args.show_left = True
@@ -1,4 +1,5 @@
 import math
+import sys
 import numpy as np
 from xensesdk.ezgl import (Matrix4x4, PointLight, GLModelItem, GLAxisItem,
                   GLGridItem, DepthCamera, MeshData, GLInstancedMeshItem)
@@ -10,10 +11,81 @@ from .sensorScene import SensorScene
 from .. import ASSET_DIR, PROJ_DIR
 import time
 from pathlib import Path
-from typing import List, Dict, Union, Optional
+from typing import TYPE_CHECKING, List, Dict, Union, Optional
 import json
 import cv2
+from functools import lru_cache
 
+if TYPE_CHECKING:
+    # fem_processor 位于calibration目录，运行时经 _ensure_calibration_path 后按需导入
+    from fem_processor import RawData
+
+
+# fem_processor.py 所在calibration目录的候选位置（相对路径以当前工作目录为准）
+_CALIBRATION_SEARCH_PATHS = (
+    Path(__file__).parent.parent / "calibration",
+    Path("calibration"),
+    Path("../calibration"),
+)
+
+
+@lru_cache(maxsize=1)
+def _locate_calibration_dir() -> Path:
+    """返回第一个包含 fem_processor.py 的候选目录；找到后缓存，未找到时抛出异常（异常不会被缓存）"""
+    for calibration_dir in _CALIBRATION_SEARCH_PATHS:
+        if (calibration_dir / "fem_processor.py").exists():
+            return calibration_dir
+    raise FileNotFoundError("未找到包含 fem_processor.py 的calibration目录")
+
+
+def _find_calibration_dir() -> Optional[Path]:
+    """calibration目录，未找到时返回 None；之后目录出现时下次调用仍能找到"""
+    try:
+        return _locate_calibration_dir()
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _ensure_calibration_path() -> Path:
+    """将calibration目录加入sys.path以便导入fem_processor，只在首次调用时修改sys.path"""
+    calibration_dir = _find_calibration_dir()
+    if calibration_dir is None:
+        raise ImportError("无法找到 fem_processor 模块")
+    if str(calibration_dir) not in sys.path:
+        sys.path.insert(0, str(calibration_dir))
+    return calibration_dir
+
+
+# 每种gel只保留一个FEM processor实例，切换材料参数时原地更新刚度矩阵
+_FEM_PROCESSORS: Dict[str, object] = {}
+
+
+@lru_cache(maxsize=32)
+def _cached_raw_data(gel_name: str, E4: int, nu4: int) -> "RawData":
+    """
+    按 (gel, E*1e4, nu*1e4) 缓存FEM原始数据，贝叶斯优化重复评估相同参数时跳过刚度矩阵重建
+
+    返回的数组设为只读，避免调用方修改缓存内容。
+    """
+    _ensure_calibration_path()
+    from fem_processor import process_gel_data
+
+    E, nu = E4 / 1e4, nu4 / 1e4
+    processor = _FEM_PROCESSORS.get(gel_name)
+    if processor is None:
+        print("🔧 首次创建FEM processor实例...")
+        processor = process_gel_data(gel_name, E=E, nu=nu, use_cache=True)
+        _FEM_PROCESSORS[gel_name] = processor
+    else:
+        print("🔄 更新现有FEM processor的材料参数...")
+        processor.update_material_properties(E=E, nu=nu)
+
+    raw_data = processor.get_data()
+    for value in raw_data:
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    return raw_data
 
 class CalibrationVecTouchSim(SensorScene):
     """
@@ -203,9 +275,6 @@ class CalibrationScene(Scene):
 
         self._load_objects()
 
-        # FEM processor（按需创建）
-        self._fem_processor = None
-
         # 场景视角
         self.cameraLookAt([0.05, 0, 0.04], [0, 0, 0.02], [0, 0, 1])
 
@@ -233,8 +302,8 @@ class CalibrationScene(Scene):
             self.objects[obj_name] = obj_model
             print(f"✓ 加载标定物体: {obj_name}")
 
-    def _load_trajectory_config(self) -> Dict[str, Dict[str, List[Dict[str, float]]]]:
-        """读取并规范化轨迹配置"""
+    def _load_trajectory_config(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """读取并规范化轨迹配置，每条轨迹为 (N, 3) 的 (dx, dy, dz) 数组，单位mm"""
         traj_path = PROJ_DIR.parent / "calibration" / "obj" / "traj.json"
         if not traj_path.exists():
             print(f"⚠️ 未找到轨迹配置文件: {traj_path}")
@@ -247,43 +316,28 @@ class CalibrationScene(Scene):
             print(f"⚠️ 轨迹配置解析失败: {exc}")
             return {}
 
-        normalized: Dict[str, Dict[str, List[Dict[str, float]]]] = {}
+        normalized: Dict[str, Dict[str, np.ndarray]] = {}
 
         for obj_name, traj_dict in raw_config.items():
             if not isinstance(traj_dict, dict):
                 continue
 
-            obj_trajs: Dict[str, List[Dict[str, float]]] = {}
+            obj_trajs: Dict[str, np.ndarray] = {}
 
             for traj_name, steps_payload in traj_dict.items():
-                steps: List[Dict[str, float]] = []
+                rows = []
 
                 if isinstance(steps_payload, dict) and {"x", "y", "z"} <= steps_payload.keys():
-                    x_seq = steps_payload.get("x", [])
-                    y_seq = steps_payload.get("y", [])
-                    z_seq = steps_payload.get("z", [])
-                    for dx, dy, dz in zip(x_seq, y_seq, z_seq):
-                        steps.append({
-                            "x": float(dx),
-                            "y": float(dy),
-                            "z": float(dz)
-                        })
+                    rows = list(zip(steps_payload["x"], steps_payload["y"], steps_payload["z"]))
                 elif isinstance(steps_payload, list):
                     for entry in steps_payload:
                         if isinstance(entry, dict):
-                            dx = float(entry.get("x", 0.0))
-                            dy = float(entry.get("y", 0.0))
-                            dz = float(entry.get("z", 0.0))
+                            rows.append((entry.get("x", 0.0), entry.get("y", 0.0), entry.get("z", 0.0)))
                         elif isinstance(entry, (list, tuple)) and len(entry) == 3:
-                            dx, dy, dz = entry
-                            dx, dy, dz = float(dx), float(dy), float(dz)
-                        else:
-                            continue
-
-                        steps.append({"x": dx, "y": dy, "z": dz})
+                            rows.append(entry)
 
-                if steps:
-                    obj_trajs[traj_name] = steps
+                if rows:
+                    obj_trajs[traj_name] = np.array(rows, dtype=np.float64).reshape(-1, 3)
 
             if obj_trajs:
                 normalized[obj_name] = obj_trajs
@@ -398,12 +452,12 @@ class CalibrationScene(Scene):
         # 更新传感器
         self.update_sensor()
 
-    def _execute_trajectory(self, trajectory_name: str, steps: List[Dict[str, float]]) -> Dict[str, Dict]:
-        """按照给定轨迹执行传感器运动并采集每一步的数据"""
+    def _execute_trajectory(self, trajectory_name: str, steps: np.ndarray) -> Dict[str, Dict]:
+        """按照给定轨迹 (N, 3) 执行传感器运动并采集每一步的数据"""
         if self.current_object is None:
             raise ValueError("未选择当前物体")
 
-        if not steps:
+        if len(steps) == 0:
             return {}
 
         # print(f"▶️  执行轨迹: {trajectory_name} (共 {len(steps)} 步)")
@@ -414,11 +468,7 @@ class CalibrationScene(Scene):
 
         trajectory_data: Dict[str, Dict] = {}
 
-        for idx, step in enumerate(steps):
-            dx = float(step.get("x", 0.0))
-            dy = float(step.get("y", 0.0))
-            dz = float(step.get("z", 0.0))
-
+        for idx, (dx, dy, dz) in enumerate(steps.tolist()):
             max_delta = max(abs(dx), abs(dy), abs(dz))
             if max_delta <= 0:
                 substeps = 1
@@ -587,8 +637,12 @@ class CalibrationScene(Scene):
         """
         print("🎯 开始采集所有物体的标定数据...")
         
+        # 换一个新字典，避免覆盖上一次返回给调用方的结果（同一场景会被多次标定复用）
+        self.calibration_data = {}
         all_data = {}
         
+        # 所有物体共用同一个传感器、FEM求解器和OpenGL上下文（通过current_object切换），
+        # 深度渲染必须在GL线程上执行，因此按物体串行采集，不能放到线程池里并行
         for obj_name in self.objects.keys():
             try:
                 obj_data = self.collect_calibration_data(obj_name)
@@ -635,35 +689,8 @@ class CalibrationScene(Scene):
         print(f"🎯 使用材料参数 E={E:.4f}, nu={nu:.4f} 进行标定...")
         
         try:
-            import sys
-            from pathlib import Path
-            possible_paths = [
-                Path(__file__).parent.parent / "calibration",
-                Path("calibration"),
-                Path("../calibration"),
-            ]
-            
-            fem_processor_found = False
-            for calibration_dir in possible_paths:
-                if calibration_dir.exists() and (calibration_dir / "fem_processor.py").exists():
-                    if str(calibration_dir) not in sys.path:
-                        sys.path.insert(0, str(calibration_dir))
-                    fem_processor_found = True
-                    break
-            
-            if not fem_processor_found:
-                raise ImportError("无法找到 fem_processor 模块")
-                
-            from fem_processor import process_gel_data
-            
-            if not hasattr(self, '_fem_processor') or self._fem_processor is None:
-                print("🔧 首次创建FEM processor实例...")
-                self._fem_processor = process_gel_data('g1-ws', E=E, nu=nu, use_cache=True)
-            else:
-                print("🔄 更新现有FEM processor的材料参数...")
-                self._fem_processor.update_material_properties(E=E, nu=nu)
-            
-            raw_data = self._fem_processor.get_data()
+            # 参数已按4位小数取整，放大为整数作为缓存键，避免浮点哈希歧义
+            raw_data = _cached_raw_data('g1-ws', int(round(E * 1e4)), int(round(nu * 1e4)))
             
             self.update_fem_data(raw_data, coef)
             
@@ -686,7 +713,7 @@ class CalibrationScene(Scene):
 
     def get_available_objects(self) -> List[str]:
         """获取可用物体列表"""
-        return list(self.objects.keys())
+        return list(self.objects)
 
     def get_calibration_data_summary(self) -> Dict:
         """获取标定数据摘要"""
@@ -733,6 +760,7 @@ def create_calibration_scene(
 
 if __name__ == '__main__':
     from pathlib import Path
+    import os
     import sys
     import time
     try:
@@ -756,26 +784,19 @@ if __name__ == '__main__':
             "tri_d6.STL"
             ]
     
-    object_files = [str(asset_dir / n) for n in candidates if (asset_dir / n).exists()]
+    # 一次读取目录后做集合查询，代替逐个 exists()；保持 candidates 的顺序
+    try:
+        with os.scandir(asset_dir) as it:
+            present = {e.name for e in it if e.is_file()}
+    except FileNotFoundError:
+        present = set()
+    object_files = [str(asset_dir / n) for n in candidates if n in present]
     if not object_files:
         print("❌ 未找到可用的物体模型")
         sys.exit(1)
 
     # 创建场景（新版）
-    possible_paths = [
-                Path(__file__).parent.parent / "calibration",
-                Path("calibration"),
-                Path("../calibration"),
-            ]
-            
-    fem_processor_found = False
-    for calibration_dir in possible_paths:
-        if calibration_dir.exists() and (calibration_dir / "fem_processor.py").exists():
-            if str(calibration_dir) not in sys.path:
-                sys.path.insert(0, str(calibration_dir))
-            fem_processor_found = True
-            break
- 
+    _ensure_calibration_path()
     from fem_processor import process_gel_data
     fem_pro = process_gel_data('g1-ws', E=0.7966, nu=0.3523, use_cache=True)
     
@@ -789,7 +810,7 @@ if __name__ == '__main__':
     scene.update_fem_data(raw_data, coef=-0.015)
 
     # 默认选择第一个物体
-    first_obj = list(scene.objects.keys())[0]
+    first_obj = next(iter(scene.objects))
     scene.set_current_object(first_obj)
     
     # 存储力数据的全局变量
@@ -797,12 +818,11 @@ if __name__ == '__main__':
 
     # UI 交互函数（接口保持一致）
     def ui_set_object(choice=0):
-        names = list(scene.objects.keys())
         if isinstance(choice, int):
-            if 0 <= choice < len(names):
-                scene.set_current_object(names[choice])
+            if 0 <= choice < len(scene.objects):
+                scene.set_current_object(list(scene.objects)[choice])
         else:
-            if choice in names:
+            if choice in scene.objects:
                 scene.set_current_object(choice)
 
     def ui_move_to_contact():
@@ -840,7 +860,7 @@ if __name__ == '__main__':
             print(f"✓ 数据已保存至: {storage_file}")
             print(f"📊 数据摘要:")
             for obj, depths in data.items():
-                print(f"  {obj}: {list(depths.keys())}")
+                print(f"  {obj}: {', '.join(depths)}")
 
         except Exception as e:
             print(f"❌ collect_all 失败: {e}")
@@ -881,7 +901,7 @@ if __name__ == '__main__':
         tb.add_text("标定场景控制（传感器下压）")
         tb.add_spacer(6)
         tb.add_text("物体选择")
-        names = list(scene.objects.keys())
+        names = list(scene.objects)
         if names:
             tb.add_combo("object", names, callback=lambda i: ui_set_object(i))
         tb.add_spacer(6)